@@ -3,29 +3,98 @@ Flask REST API for Predictive Maintenance System
 Provides endpoints for engine predictions and data retrieval
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
 import joblib
+import orjson
+from numba import njit, types
+from sklearn.pipeline import Pipeline
 import os
 from datetime import datetime
 
+from model_utils import SENSOR_DTYPES
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson
+    Serializes floats and numpy scalars in C instead of the stdlib encoder
+    """
+    
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        option = self.option
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)  # Enable CORS for React frontend
 
 # Load model and data
 model_data = None
 df = None
 
+# Health status labels indexed by classify_status_kernel codes
+STATUS_LABELS = np.array(['normal', 'warning', 'critical'])
+
+# Kernel input type; sensor columns may be read-only when memory-mapped from Parquet
+SENSOR_ARRAY = types.Array(types.float32, 1, 'A', readonly=True)
+
+# Per-engine row positions into df, built once in load_resources
+engine_index = {}   # engine_id -> ndarray of positional row indices (timestamp order)
+latest_index = {}   # engine_id -> positional index of the engine's latest row
+
+# Latest reading per engine, one row per engine in latest_index order
+latest_df = None
+
+# The same readings in Structure-of-Arrays layout for the status kernel:
+# one contiguous float32 row per sensor
+SENSOR_COLS = ['temperature', 'pressure', 'vibration', 'oil_quality']
+latest_sensors = None   # (len(SENSOR_COLS), n_engines) float32
+latest_failure = None   # (n_engines,) int8
+
+# engine_id -> (prediction, failure probability) for the engine's latest reading
+prediction_table = {}
+
+# Upper bound on readings returned by one /api/engine/<id>/history request
+MAX_HISTORY_HOURS = 10000
+
+# Rows serialized per chunk when streaming /api/engine/<id>/history
+HISTORY_CHUNK_ROWS = 1024
+
+# JSON payloads derived only from df, keyed by (data_version, endpoint).
+# df is never mutated between loads, so entries stay valid until the next reload.
+data_version = 0
+response_cache = {}
+
 def load_resources():
     """Load model and data on startup"""
-    global model_data, df
+    global model_data, df, engine_index, latest_index, data_version, prediction_table
+    global latest_df, latest_sensors, latest_failure
     
     # Load model
     model_path = '../datasets/failure_predictor.pkl'
     if os.path.exists(model_path):
         model_data = joblib.load(model_path)
+        
+        # Chain the fitted scaler (if the model was trained on scaled
+        # features) and model once so each request is a single sklearn call
+        # over columns in the training feature order
+        model_data['pipeline'] = Pipeline([
+            ('scaler', model_data['scaler'] if model_data['scaler'] is not None else 'passthrough'),
+            ('model', model_data['model'])
+        ])
+        model_data['feature_cols'] = list(model_data['feature_names'])
         print(" Model loaded successfully")
     else:
         print("  Model not found. Please run train_model.py first")
@@ -33,11 +102,126 @@ def load_resources():
     # Load data
     data_path = '../datasets/sensor_data.csv'
     if os.path.exists(data_path):
-        df = pd.read_csv(data_path)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df = load_sensor_data(data_path)
+        
+        # Sort once so every engine's rows are contiguous and in time order,
+        # then cache positional indexers so endpoints never rescan df
+        df = df.sort_values(['engine_id', 'timestamp']).reset_index(drop=True)
+        engine_index = df.groupby('engine_id', sort=True).indices
+        latest_index = {engine_id: idx[-1] for engine_id, idx in engine_index.items()}
+        
+        latest_df = df.iloc[list(latest_index.values())].reset_index(drop=True)
+        latest_sensors = np.ascontiguousarray(latest_df[SENSOR_COLS].to_numpy(np.float32).T)
+        latest_failure = latest_df['failure'].to_numpy(np.int8)
+        
+        # Invalidate cached responses computed from the previous data
+        data_version += 1
+        response_cache.clear()
         print(f" Data loaded: {len(df):,} records")
     else:
         print("  Data not found. Please run data_simulator.py first")
+    
+    if model_data is not None and df is not None:
+        prediction_table = predict_latest()
+        print(f" Predictions ready for {len(prediction_table)} engines")
+    
+    # Build the fleet-wide payloads now so no request pays for them
+    if df is not None:
+        cached_payload('engines', build_engines_payload)
+        cached_payload('fleet_stats', build_fleet_stats_payload)
+
+def predict_latest(window=50):
+    """
+    Predict failure for every engine's latest reading in one batch
+    
+    Args:
+        window (int): Trailing readings per engine used for rolling features
+        
+    Returns:
+        dict: engine_id -> (prediction, failure probability)
+    """
+    # Feature-engineer the trailing window of every engine in one pass;
+    # rolling features are computed per engine so windows don't mix
+    tail_rows = np.concatenate([idx[-window:] for idx in engine_index.values()])
+    features = model_data['feature_engineer'].prepare_features(df.iloc[tail_rows].copy())
+    latest_features = features.groupby('engine_id', sort=True).tail(1)
+    
+    # Scale and predict with one predict_proba call; the predicted class is
+    # the argmax, exactly as model.predict would return it
+    pipeline = model_data['pipeline']
+    X = latest_features[model_data['feature_cols']].to_numpy(dtype=np.float32)
+    proba = pipeline.predict_proba(X)
+    predictions = pipeline.classes_[np.argmax(proba, axis=1)]
+    
+    return {
+        engine_id: (int(prediction), float(probability))
+        for engine_id, prediction, probability in zip(
+            latest_features['engine_id'], predictions, proba[:, 1]
+        )
+    }
+
+def load_sensor_data(csv_path):
+    """
+    Load sensor data through a typed Parquet copy of the CSV
+    
+    The Parquet file sits next to the CSV and is rebuilt whenever the CSV is
+    newer, so the pipeline scripts can keep writing CSV.
+    
+    Args:
+        csv_path (str): Path to sensor_data.csv
+        
+    Returns:
+        DataFrame: Sensor data with compact dtypes and parsed timestamps
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return pd.read_parquet(parquet_path, memory_map=True)
+    
+    data = pd.read_csv(csv_path, dtype=SENSOR_DTYPES, parse_dates=['timestamp'])
+    
+    # Write to a temporary file and rename it into place, so the dashboard or
+    # training reading the Parquet copy never sees a half-written file
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        data.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        print(f" Cached typed copy of sensor data: {parquet_path}")
+    except OSError as e:
+        print(f"  Could not write {parquet_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
+
+def format_iso_timestamps(timestamps):
+    """
+    Vectorized equivalent of Timestamp.isoformat() for a datetime column
+    
+    Args:
+        timestamps (Series): datetime64 values
+        
+    Returns:
+        Series: ISO 8601 strings, with microseconds only when non-zero
+    """
+    seconds = timestamps.dt.strftime('%Y-%m-%dT%H:%M:%S')
+    with_micros = seconds + timestamps.dt.strftime('.%f')
+    return seconds.where(timestamps.dt.microsecond == 0, with_micros)
+
+def cached_payload(name, build):
+    """
+    Return the cached payload for an endpoint, building it once per data version
+    
+    Args:
+        name (str): Cache key for the endpoint
+        build (callable): Function returning the JSON-serializable payload
+        
+    Returns:
+        dict: Payload ready for jsonify
+    """
+    key = (data_version, name)
+    if key not in response_cache:
+        response_cache[key] = build()
+    return response_cache[key]
 
 @app.route('/', methods=['GET'])
 def root():
@@ -58,62 +242,94 @@ def health_check():
         'timestamp': datetime.now().isoformat()
     })
 
-@app.route('/api/engines', methods=['GET'])
-def get_engines():
-    """Get list of all engines"""
-    if df is None:
-        return jsonify({'error': 'Data not loaded'}), 500
-    
-    engines = df['engine_id'].unique().tolist()
-    engines.sort()
-    
-    # Get latest status for each engine
-    engine_list = []
-    for engine_id in engines:
-        engine_data = df[df['engine_id'] == engine_id].sort_values('timestamp')
-        latest = engine_data.iloc[-1]
+@njit(
+    types.void(
+        SENSOR_ARRAY, SENSOR_ARRAY, SENSOR_ARRAY, SENSOR_ARRAY,
+        types.Array(types.int8, 1, 'A', readonly=True),
+        types.Array(types.uint8, 1, 'C')
+    ),
+    cache=True, nogil=True
+)
+def classify_status_kernel(temperature, pressure, vibration, oil_quality, failure, out):
+    """
+    Fused health-status kernel over float32 sensor arrays
+    Writes 0 = normal, 1 = warning, 2 = critical into out
+    
+    The explicit signature compiles the kernel at import time (or loads it
+    from Numba's on-disk cache) instead of on the first request.
+    """
+    for i in range(temperature.size):
+        # Critical > Warning > Normal
+        if failure[i] == 1:
+            out[i] = 2
+            continue
         
-        # Determine health status based on sensor readings and failure flag
-        has_failure_flag = latest['failure'] == 1
+        t = temperature[i]
+        p = pressure[i]
+        v = vibration[i]
+        o = oil_quality[i]
         
         # Sensor-based health assessment
-        temp_normal = 580 <= latest['temperature'] <= 640
-        pressure_normal = 54.5 <= latest['pressure'] <= 55.5
-        vibration_normal = latest['vibration'] <= 15
-        oil_good = latest['oil_quality'] >= 20
+        healthy_indicators = (
+            (np.float32(580) <= t <= np.float32(640)) +
+            (np.float32(54.5) <= p <= np.float32(55.5)) +
+            (v <= np.float32(15)) +
+            (o >= np.float32(20))
+        )
         
         # Warning thresholds (degrading zone)
-        temp_warning = 630 <= latest['temperature'] <= 650 or latest['temperature'] < 570
-        pressure_warning = 55.3 <= latest['pressure'] <= 55.7 or latest['pressure'] < 54.3
-        vibration_warning = 12 <= latest['vibration'] <= 18
-        oil_warning = 15 <= latest['oil_quality'] < 25
-        
-        healthy_indicators = sum([temp_normal, pressure_normal, vibration_normal, oil_good])
-        warning_indicators = sum([temp_warning, pressure_warning, vibration_warning, oil_warning])
+        warning_indicators = (
+            ((np.float32(630) <= t <= np.float32(650)) or t < np.float32(570)) +
+            ((np.float32(55.3) <= p <= np.float32(55.7)) or p < np.float32(54.3)) +
+            (np.float32(12) <= v <= np.float32(18)) +
+            (np.float32(15) <= o < np.float32(25))
+        )
         
-        # Determine status: Critical > Warning > Normal
-        if has_failure_flag:
-            status = 'critical'
-        elif warning_indicators >= 2 or healthy_indicators < 3:
-            status = 'warning'  # Degrading
-        else:
-            status = 'normal'   # Healthy
+        out[i] = 1 if (warning_indicators >= 2 or healthy_indicators < 3) else 0
+
+def classify_engine_status(sensors, failure):
+    """
+    Classify engines as critical / warning / normal from their latest readings
+    
+    Args:
+        sensors (ndarray): (4, n) float32 rows of temperature, pressure, vibration, oil quality
+        failure (ndarray): (n,) int8 failure flags
         
-        engine_list.append({
-            'id': int(engine_id),
-            'name': f'ENG-{engine_id:03d}',
-            'status': status,
-            'operating_hours': int(latest['operating_hours']),
-            'temperature': float(latest['temperature']),
-            'pressure': float(latest['pressure']),
-            'vibration': float(latest['vibration']),
-            'oil_quality': float(latest['oil_quality'])
-        })
+    Returns:
+        ndarray: uint8 status code per engine (index into STATUS_LABELS)
+    """
+    temperature, pressure, vibration, oil_quality = sensors
+    codes = np.empty(failure.size, dtype=np.uint8)
+    classify_status_kernel(temperature, pressure, vibration, oil_quality, failure, codes)
+    return codes
+
+@app.route('/api/engines', methods=['GET'])
+def get_engines():
+    """Get list of all engines"""
+    if df is None:
+        return jsonify({'error': 'Data not loaded'}), 500
     
-    return jsonify({
+    return jsonify(cached_payload('engines', build_engines_payload))
+
+def build_engines_payload():
+    """Build the /api/engines payload from the latest reading of each engine"""
+    # Get latest status for each engine in one vectorized pass
+    latest = latest_df
+    engines = {
+        'id': latest['engine_id'].astype(int).tolist(),
+        'name': ('ENG-' + latest['engine_id'].map('{:03d}'.format)).tolist(),
+        'status': STATUS_LABELS[classify_engine_status(latest_sensors, latest_failure)].tolist(),
+        'operating_hours': latest['operating_hours'].astype(int).tolist(),
+        # Sensors stay float32 scalars: orjson writes their shortest repr
+        # (55.137), where widening to float would print 55.137001037597656
+        **{col: list(latest[col].to_numpy()) for col in SENSOR_COLS}
+    }
+    engine_list = [dict(zip(engines, values)) for values in zip(*engines.values())]
+    
+    return {
         'engines': engine_list,
         'total': len(engine_list)
-    })
+    }
 
 @app.route('/api/engine/<int:engine_id>', methods=['GET'])
 def get_engine(engine_id):
@@ -121,21 +337,19 @@ def get_engine(engine_id):
     if df is None:
         return jsonify({'error': 'Data not loaded'}), 500
     
-    engine_data = df[df['engine_id'] == engine_id].sort_values('timestamp')
-    
-    if len(engine_data) == 0:
+    if engine_id not in latest_index:
         return jsonify({'error': 'Engine not found'}), 404
     
-    latest = engine_data.iloc[-1]
+    latest = df.iloc[latest_index[engine_id]]
     
     return jsonify({
         'id': int(engine_id),
         'name': f'ENG-{engine_id:03d}',
         'current_status': {
-            'temperature': float(latest['temperature']),
-            'pressure': float(latest['pressure']),
-            'vibration': float(latest['vibration']),
-            'oil_quality': float(latest['oil_quality']),
+            'temperature': latest['temperature'],
+            'pressure': latest['pressure'],
+            'vibration': latest['vibration'],
+            'oil_quality': latest['oil_quality'],
             'operating_hours': int(latest['operating_hours']),
             'failure': bool(latest['failure']),
             'timestamp': latest['timestamp'].isoformat()
@@ -149,29 +363,85 @@ def get_engine_history(engine_id):
         return jsonify({'error': 'Data not loaded'}), 500
     
     # Get query parameters
-    hours = int(request.args.get('hours', 168))  # Default: 7 days
-    
-    engine_data = df[df['engine_id'] == engine_id].sort_values('timestamp').tail(hours)
-    
-    if len(engine_data) == 0:
+    try:
+        hours = int(request.args.get('hours', 168))  # Default: 7 days
+    except ValueError:
+        return jsonify({'error': 'hours must be an integer'}), 400
+    hours = min(max(hours, 1), MAX_HISTORY_HOURS)
+    
+    # Optional cursor: only return readings strictly before this timestamp
+    before = request.args.get('before')
+    if before is not None:
+        try:
+            before = pd.Timestamp(before)
+        except ValueError:
+            before = pd.NaT
+        # An empty value (or 'NaT') parses to NaT instead of raising
+        if before is pd.NaT:
+            return jsonify({'error': 'before must be an ISO timestamp'}), 400
+        if before.tzinfo is not None:
+            before = before.tz_convert(None)
+    
+    if engine_id not in engine_index:
         return jsonify({'error': 'Engine not found'}), 404
     
-    history = []
-    for _, row in engine_data.iterrows():
-        history.append({
-            'timestamp': row['timestamp'].isoformat(),
-            'temperature': float(row['temperature']),
-            'pressure': float(row['pressure']),
-            'vibration': float(row['vibration']),
-            'oil_quality': float(row['oil_quality']),
-            'failure': bool(row['failure'])
-        })
+    rows = engine_index[engine_id]
+    if before is not None:
+        end = np.searchsorted(df['timestamp'].to_numpy()[rows], before.to_datetime64(), side='left')
+        rows = rows[max(0, end - hours):end]
+    else:
+        rows = rows[-hours:]
+    
+    engine_data = df.iloc[rows]
+    count = len(engine_data)
+    
+    # Stream the history array in chunks so only one chunk of rows is
+    # materialized and serialized at a time
+    def generate():
+        yield b'{"count":%d,"engine_id":%d,"history":[' % (count, engine_id)
+        for start in range(0, count, HISTORY_CHUNK_ROWS):
+            records = history_records(engine_data.iloc[start:start + HISTORY_CHUNK_ROWS])
+            chunk = orjson.dumps(records, option=ORJSONProvider.option)[1:-1]
+            yield chunk if start == 0 else b',' + chunk
+        yield b']}'
+    
+    return Response(generate(), mimetype='application/json')
+
+def history_records(engine_data):
+    """
+    Convert a slice of sensor rows to history records
     
-    return jsonify({
-        'engine_id': engine_id,
-        'history': history,
-        'count': len(history)
-    })
+    Args:
+        engine_data (DataFrame): Rows of a single engine
+        
+    Returns:
+        list: One dict per row; sensor values are float32 scalars, which
+            orjson serializes at their shortest repr
+    """
+    # Pull each column out once instead of materializing a Series per row
+    # with iterrows()
+    # Only this chunk's timestamps are formatted; a per-row string column
+    # for the whole dataset would outweigh the numeric data
+    timestamps = format_iso_timestamps(engine_data['timestamp']).tolist()
+    temperature = engine_data['temperature'].to_numpy()
+    pressure = engine_data['pressure'].to_numpy()
+    vibration = engine_data['vibration'].to_numpy()
+    oil_quality = engine_data['oil_quality'].to_numpy()
+    failure = engine_data['failure'].astype(bool).tolist()
+    
+    return [
+        {
+            'timestamp': ts,
+            'temperature': temp,
+            'pressure': pres,
+            'vibration': vib,
+            'oil_quality': oil,
+            'failure': fail
+        }
+        for ts, temp, pres, vib, oil, fail in zip(
+            timestamps, temperature, pressure, vibration, oil_quality, failure
+        )
+    ]
 
 @app.route('/api/predict/<int:engine_id>', methods=['GET'])
 def predict_failure(engine_id):
@@ -180,37 +450,15 @@ def predict_failure(engine_id):
         return jsonify({'error': 'Resources not loaded'}), 500
     
     # Get engine data
-    engine_data = df[df['engine_id'] == engine_id].sort_values('timestamp')
-    
-    if len(engine_data) == 0:
+    if engine_id not in engine_index:
         return jsonify({'error': 'Engine not found'}), 404
     
-    # Get last 50 readings for feature engineering
-    temp_df = engine_data.tail(50).copy()
-    
-    # Feature engineering
-    feature_engineer = model_data['feature_engineer']
-    temp_df = feature_engineer.prepare_features(temp_df)
-    
-    if len(temp_df) == 0:
+    # Predictions are precomputed for every engine in load_resources
+    if engine_id not in prediction_table:
         return jsonify({'error': 'Insufficient data for prediction'}), 400
     
-    # Get features
-    exclude_cols = ['timestamp', 'engine_id', 'failure']
-    feature_cols = [col for col in temp_df.columns if col not in exclude_cols]
-    
-    # Scale and predict
-    scaler = model_data['scaler']
-    model = model_data['model']
-    
-    X = temp_df[feature_cols].iloc[-1:].values
-    X_scaled = scaler.transform(X)
-    
-    prediction = int(model.predict(X_scaled)[0])
-    probability = float(model.predict_proba(X_scaled)[0][1])
-    
-    # Get current sensor readings
-    latest = engine_data.iloc[-1]
+    prediction, probability = prediction_table[engine_id]
+    latest = df.iloc[latest_index[engine_id]]
     
     return jsonify({
         'engine_id': engine_id,
@@ -220,58 +468,82 @@ def predict_failure(engine_id):
             'confidence': probability if prediction == 1 else (1 - probability)
         },
         'current_readings': {
-            'temperature': float(latest['temperature']),
-            'pressure': float(latest['pressure']),
-            'vibration': float(latest['vibration']),
-            'oil_quality': float(latest['oil_quality']),
+            'temperature': latest['temperature'],
+            'pressure': latest['pressure'],
+            'vibration': latest['vibration'],
+            'oil_quality': latest['oil_quality'],
             'operating_hours': int(latest['operating_hours'])
         },
         'recommendation': get_recommendation(prediction, probability, latest)
     })
 
-def get_recommendation(prediction, probability, sensor_data):
-    """Generate maintenance recommendation"""
-    if prediction == 1:
-        if probability > 0.9:
-            return {
-                'priority': 'critical',
-                'action': 'Schedule immediate maintenance',
-                'message': 'Critical failure imminent. Stop operation and inspect immediately.'
-            }
-        elif probability > 0.7:
-            return {
-                'priority': 'high',
-                'action': 'Schedule maintenance within 24 hours',
-                'message': 'High failure probability detected. Reduce load and schedule inspection.'
-            }
-        else:
-            return {
-                'priority': 'medium',
-                'action': 'Schedule maintenance within week',
-                'message': 'Elevated failure risk. Monitor closely and plan maintenance.'
-            }
-    else:
-        # Check individual sensors
-        warnings = []
-        if sensor_data['temperature'] > 100:
-            warnings.append('High temperature detected')
-        if sensor_data['vibration'] > 8:
-            warnings.append('Excessive vibration detected')
-        if sensor_data['oil_quality'] < 40:
-            warnings.append('Low oil quality')
+# Recommendations when a failure is predicted, indexed by risk level:
+# 0 = probability <= 0.7, 1 = probability <= 0.9, 2 = probability > 0.9
+FAILURE_RECOMMENDATIONS = (
+    {
+        'priority': 'medium',
+        'action': 'Schedule maintenance within week',
+        'message': 'Elevated failure risk. Monitor closely and plan maintenance.'
+    },
+    {
+        'priority': 'high',
+        'action': 'Schedule maintenance within 24 hours',
+        'message': 'High failure probability detected. Reduce load and schedule inspection.'
+    },
+    {
+        'priority': 'critical',
+        'action': 'Schedule immediate maintenance',
+        'message': 'Critical failure imminent. Stop operation and inspect immediately.'
+    }
+)
+
+# Individual sensor warnings; bit i of a warning mask means SENSOR_WARNINGS[i] applies
+SENSOR_WARNINGS = (
+    'High temperature detected',
+    'Excessive vibration detected',
+    'Low oil quality'
+)
+
+def build_sensor_recommendations():
+    """
+    Precompute the no-failure recommendation for every sensor warning mask
+    
+    Returns:
+        tuple: Recommendation dict indexed by warning mask
+    """
+    recommendations = []
+    for mask in range(1 << len(SENSOR_WARNINGS)):
+        warnings = [warning for bit, warning in enumerate(SENSOR_WARNINGS) if mask & (1 << bit)]
         
         if warnings:
-            return {
+            recommendations.append({
                 'priority': 'low',
                 'action': 'Monitor sensors',
                 'message': f'Normal operation with warnings: {", ".join(warnings)}'
-            }
-        
-        return {
-            'priority': 'normal',
-            'action': 'Continue normal operation',
-            'message': 'All systems operating within normal parameters.'
-        }
+            })
+        else:
+            recommendations.append({
+                'priority': 'normal',
+                'action': 'Continue normal operation',
+                'message': 'All systems operating within normal parameters.'
+            })
+    
+    return tuple(recommendations)
+
+SENSOR_RECOMMENDATIONS = build_sensor_recommendations()
+
+def get_recommendation(prediction, probability, sensor_data):
+    """Generate maintenance recommendation"""
+    if prediction == 1:
+        return FAILURE_RECOMMENDATIONS[int(probability > 0.7) + int(probability > 0.9)]
+    
+    # Check individual sensors
+    warning_mask = (
+        int(sensor_data['temperature'] > 100)
+        | int(sensor_data['vibration'] > 8) << 1
+        | int(sensor_data['oil_quality'] < 40) << 2
+    )
+    return SENSOR_RECOMMENDATIONS[warning_mask]
 
 @app.route('/api/fleet/stats', methods=['GET'])
 def get_fleet_stats():
@@ -279,43 +551,31 @@ def get_fleet_stats():
     if df is None:
         return jsonify({'error': 'Data not loaded'}), 500
     
+    return jsonify(cached_payload('fleet_stats', build_fleet_stats_payload))
+
+def build_fleet_stats_payload():
+    """Build the /api/fleet/stats payload from the latest reading of each engine"""
     # Get latest reading per engine
-    latest_per_engine = df.sort_values('timestamp').groupby('engine_id').tail(1)
+    latest_per_engine = latest_df
     
-    total_engines = df['engine_id'].nunique()
+    total_engines = len(latest_index)
     
     # Calculate health status based on sensor readings and failure flags
-    has_failure_flag = latest_per_engine['failure'] == 1
-    
-    # Sensor-based health assessment
-    temp_normal = (latest_per_engine['temperature'] >= 580) & (latest_per_engine['temperature'] <= 640)
-    pressure_normal = (latest_per_engine['pressure'] >= 54.5) & (latest_per_engine['pressure'] <= 55.5)
-    vibration_normal = latest_per_engine['vibration'] <= 15
-    oil_good = latest_per_engine['oil_quality'] >= 20
-    
-    # Warning thresholds (degrading zone)
-    temp_warning = ((latest_per_engine['temperature'] >= 630) & (latest_per_engine['temperature'] <= 650)) | (latest_per_engine['temperature'] < 570)
-    pressure_warning = ((latest_per_engine['pressure'] >= 55.3) & (latest_per_engine['pressure'] <= 55.7)) | (latest_per_engine['pressure'] < 54.3)
-    vibration_warning = (latest_per_engine['vibration'] >= 12) & (latest_per_engine['vibration'] <= 18)
-    oil_warning = (latest_per_engine['oil_quality'] >= 15) & (latest_per_engine['oil_quality'] < 25)
-    
-    healthy_indicators = temp_normal.astype(int) + pressure_normal.astype(int) + vibration_normal.astype(int) + oil_good.astype(int)
-    warning_indicators = temp_warning.astype(int) + pressure_warning.astype(int) + vibration_warning.astype(int) + oil_warning.astype(int)
-    
-    # Count engines by category
-    critical_engines = int(has_failure_flag.sum())
-    warning_engines = int(((~has_failure_flag) & ((warning_indicators >= 2) | (healthy_indicators < 3))).sum())
+    status = classify_engine_status(latest_sensors, latest_failure)
+    
+    # Count engines by category in one pass over the status codes
+    _, warning_engines, critical_engines = np.bincount(status, minlength=len(STATUS_LABELS)).tolist()
     healthy_engines = total_engines - critical_engines - warning_engines
     
     avg_metrics = {
-        'temperature': float(latest_per_engine['temperature'].mean()),
-        'pressure': float(latest_per_engine['pressure'].mean()),
-        'vibration': float(latest_per_engine['vibration'].mean()),
-        'oil_quality': float(latest_per_engine['oil_quality'].mean()),
+        'temperature': latest_per_engine['temperature'].mean(),
+        'pressure': latest_per_engine['pressure'].mean(),
+        'vibration': latest_per_engine['vibration'].mean(),
+        'oil_quality': latest_per_engine['oil_quality'].mean(),
         'operating_hours': float(latest_per_engine['operating_hours'].mean())
     }
     
-    return jsonify({
+    return {
         'total_engines': total_engines,
         'healthy_engines': healthy_engines,
         'warning_engines': warning_engines,
@@ -325,7 +585,7 @@ def get_fleet_stats():
         'critical_percentage': round((critical_engines / total_engines) * 100, 1),
         'average_metrics': avg_metrics,
         'total_readings': len(df)
-    })
+    }
 
 @app.route('/api/roi/calculate', methods=['POST'])
 def calculate_roi():
@@ -347,13 +607,13 @@ def calculate_roi():
     payback_period = initial_investment / net_savings if net_savings > 0 else float('inf')
     
     # 5-year projection
-    projections = []
-    for year in range(1, 6):
-        projections.append({
-            'year': year,
-            'savings': net_savings * year,
-            'roi': ((net_savings * year) / initial_investment) * 100 if initial_investment > 0 else 0
-        })
+    years = np.arange(1, 6)
+    savings = net_savings * years
+    rois = (savings / initial_investment) * 100 if initial_investment > 0 else np.zeros(len(years), dtype=int)
+    projections = [
+        {'year': year, 'savings': saving, 'roi': roi}
+        for year, saving, roi in zip(years.tolist(), savings.tolist(), rois.tolist())
+    ]
     
     return jsonify({
         'input_parameters': {
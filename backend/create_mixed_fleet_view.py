@@ -24,33 +24,32 @@ def create_mixed_fleet_snapshot():
     # For each engine, randomly select a point in its lifecycle
     # This simulates a fleet where engines are at different ages
     
-    selected_records = []
-    
-    for engine_id in df['engine_id'].unique():
-        engine_data = df[df['engine_id'] == engine_id].sort_values('operating_hours')
-        total_cycles = len(engine_data)
-        
-        # Randomly choose a lifecycle stage for this engine
-        stage = np.random.choice(['early', 'mid', 'late'], p=[0.5, 0.3, 0.2])
-        
-        if stage == 'early':
-            # Select from first 30% of lifecycle (healthy)
-            cycle_idx = np.random.randint(0, max(1, int(total_cycles * 0.3)))
-        elif stage == 'mid':
-            # Select from middle 40% (some degradation)
-            start = int(total_cycles * 0.3)
-            end = int(total_cycles * 0.7)
-            cycle_idx = np.random.randint(start, max(start+1, end))
-        else:  # late
-            # Select from last 30% (at risk)
-            start = int(total_cycles * 0.7)
-            cycle_idx = np.random.randint(start, total_cycles)
-        
-        selected_record = engine_data.iloc[cycle_idx:cycle_idx+1]
-        selected_records.append(selected_record)
-    
-    # Combine all selected records
-    mixed_fleet = pd.concat(selected_records, ignore_index=True)
+    # Sort once so each engine's cycles are one contiguous block
+    df = df.sort_values(['engine_id', 'operating_hours']).reset_index(drop=True)
+    total_cycles = df.groupby('engine_id', sort=True).size().to_numpy()
+    block_starts = np.concatenate([[0], np.cumsum(total_cycles)[:-1]])
+    num_engines = len(total_cycles)
+    
+    # Randomly choose a lifecycle stage for every engine at once
+    # 0 = early, 1 = mid, 2 = late
+    stage = np.random.choice([0, 1, 2], size=num_engines, p=[0.5, 0.3, 0.2])
+    
+    cut_30 = (total_cycles * 0.3).astype(int)
+    cut_70 = (total_cycles * 0.7).astype(int)
+    
+    # Early: first 30% of lifecycle (healthy)
+    # Mid: middle 40% (some degradation)
+    # Late: last 30% (at risk)
+    low = np.select([stage == 0, stage == 1], [0, cut_30], default=cut_70)
+    high = np.select(
+        [stage == 0, stage == 1],
+        [np.maximum(1, cut_30), np.maximum(cut_30 + 1, cut_70)],
+        default=total_cycles
+    )
+    cycle_idx = low + (np.random.rand(num_engines) * (high - low)).astype(int)
+    
+    # Take every selected record with one positional lookup
+    mixed_fleet = df.iloc[block_starts + cycle_idx].reset_index(drop=True)
     
     # Update timestamps to be "current"
     now = datetime.now()
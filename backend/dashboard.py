@@ -12,6 +12,9 @@ from plotly.subplots import make_subplots
 import joblib
 import os
 from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from model_utils import SENSOR_DTYPES
 
 # Page configuration
 st.set_page_config(
@@ -70,13 +73,100 @@ def load_model():
 
 @st.cache_data
 def load_data():
-    """Load sensor data"""
+    """
+    Load sensor data sorted by engine and time
+    
+    Returns:
+        tuple: (DataFrame, dict mapping engine_id to its (start, stop) row range),
+            or (None, None) if the data file is missing
+    """
     data_path = '../datasets/sensor_data.csv'
+    parquet_path = '../datasets/sensor_data.parquet'
     if os.path.exists(data_path):
-        df = pd.read_csv(data_path)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        return df
-    return None
+        # Prefer the typed Parquet copy written by the API (no text parsing needed),
+        # unless the CSV has been regenerated since
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(data_path):
+            df = pd.read_parquet(parquet_path, engine='pyarrow')
+        else:
+            df = pd.read_csv(data_path, dtype=SENSOR_DTYPES, parse_dates=['timestamp'])
+        
+        df = df.sort_values(['engine_id', 'timestamp']).reset_index(drop=True)
+        
+        # Each engine's rows are contiguous, so its range is found by binary search
+        engine_ids = df['engine_id'].unique()
+        starts = df['engine_id'].searchsorted(engine_ids, side='left')
+        stops = df['engine_id'].searchsorted(engine_ids, side='right')
+        engine_rows = {
+            int(engine_id): (int(start), int(stop))
+            for engine_id, start, stop in zip(engine_ids, starts, stops)
+        }
+        return df, engine_rows
+    return None, None
+
+
+@st.cache_data
+def compute_fleet_stats(df):
+    """
+    Compute fleet-wide summary statistics (cached across reruns)
+    
+    Args:
+        df (pd.DataFrame): Sensor data for the whole fleet
+        
+    Returns:
+        tuple: (total_engines, total_readings, avg_operating_hours)
+    """
+    max_hours = df.groupby('engine_id')['operating_hours'].max()
+    
+    return len(max_hours), len(df), max_hours.mean()
+
+
+@st.cache_data
+def get_latest_readings(df):
+    """Get the most recent reading of every engine (cached across reruns)"""
+    return df.sort_values('timestamp').groupby('engine_id').tail(1)
+
+
+class ROIMetrics(NamedTuple):
+    """Return on Investment metrics (floats, or arrays from calculate_roi_vec)"""
+    total_failure_cost: float
+    maintenance_cost: float
+    net_savings: float
+    roi_percentage: float
+    payback_period: float
+
+
+def calculate_roi_vec(prevented_failures, cost_per_failure, maintenance_cost, investment):
+    """
+    Vectorized ROI calculation over arrays of scenarios (e.g. a sensitivity grid)
+    
+    Args:
+        prevented_failures (array-like): Number of failures prevented
+        cost_per_failure (array-like): Average cost of an unplanned failure
+        maintenance_cost (array-like): Annual predictive maintenance cost
+        investment (array-like): Initial investment in the system
+        
+    Returns:
+        ROIMetrics: Arrays broadcast from the inputs
+    """
+    prevented_failures, cost_per_failure, maintenance_cost, investment = np.broadcast_arrays(
+        *(np.asarray(arg, dtype=float) for arg in
+          (prevented_failures, cost_per_failure, maintenance_cost, investment))
+    )
+    
+    # Calculate savings
+    total_failure_cost = prevented_failures * cost_per_failure
+    net_savings = total_failure_cost - maintenance_cost
+    
+    # Calculate ROI; without an investment there is no ROI and no payback
+    has_investment = investment > 0
+    roi_percentage = np.divide(net_savings, investment,
+                               out=np.zeros_like(net_savings), where=has_investment) * 100
+    payback_period = np.divide(investment, net_savings,
+                               out=np.full_like(net_savings, np.inf),
+                               where=has_investment & (net_savings > 0))
+    
+    return ROIMetrics(total_failure_cost, maintenance_cost, net_savings,
+                      roi_percentage, payback_period)
 
 
 def calculate_roi(prevented_failures, cost_per_failure, maintenance_cost, investment):
@@ -90,27 +180,147 @@ def calculate_roi(prevented_failures, cost_per_failure, maintenance_cost, invest
         investment (float): Initial investment in the system
         
     Returns:
-        dict: ROI metrics
+        ROIMetrics: ROI metrics
     """
-    # Calculate savings
-    total_failure_cost = prevented_failures * cost_per_failure
-    net_savings = total_failure_cost - maintenance_cost
+    metrics = calculate_roi_vec(prevented_failures, cost_per_failure, maintenance_cost, investment)
+    return ROIMetrics(*(float(value) for value in metrics))
+
+
+@st.cache_data
+def latest_engine_features(df, _engine_rows, _model_data):
+    """
+    Model input features of each engine's latest reading (cached across reruns)
     
-    # Calculate ROI
-    if investment > 0:
-        roi_percentage = (net_savings / investment) * 100
-        payback_period = investment / net_savings if net_savings > 0 else float('inf')
-    else:
-        roi_percentage = 0
-        payback_period = float('inf')
-    
-    return {
-        'total_failure_cost': total_failure_cost,
-        'maintenance_cost': maintenance_cost,
-        'net_savings': net_savings,
-        'roi_percentage': roi_percentage,
-        'payback_period': payback_period
-    }
+    Rolling features are computed per engine over the full history once, and
+    only the latest row of each engine is kept, since that is all the
+    predictions use. The cached frame is one row per engine, so reruns
+    don't pay to unpickle the full feature frame.
+    
+    Args:
+        df (pd.DataFrame): Sensor data sorted by engine and time
+        _engine_rows (dict): engine_id -> (start, stop) row range in df
+        _model_data (dict): Loaded model bundle
+        
+    Returns:
+        pd.DataFrame: Features indexed by engine_id, for engines whose latest
+            reading has features
+    """
+    features = _model_data['feature_engineer'].prepare_features(df)
+    latest_rows = features.index.intersection([stop - 1 for start, stop in _engine_rows.values()])
+    
+    exclude_cols = ['timestamp', 'engine_id', 'failure']
+    feature_cols = [col for col in features.columns if col not in exclude_cols]
+    latest = features.loc[latest_rows, feature_cols]
+    latest.index = df.loc[latest_rows, 'engine_id'].to_numpy()
+    return latest
+
+
+@st.cache_data
+def predict_engine(engine_id, latest_timestamp, _latest_features, _model_data):
+    """
+    Predict failure for an engine from its latest reading
+    
+    Results are cached per (engine_id, latest_timestamp), so reruns that don't
+    bring a new reading skip inference. The underscore arguments are not
+    hashed by Streamlit.
+    
+    Args:
+        engine_id (int): Engine identifier
+        latest_timestamp (Timestamp): Time of the engine's latest reading
+        _latest_features (pd.DataFrame): Output of latest_engine_features
+        _model_data (dict): Loaded model bundle
+        
+    Returns:
+        tuple: (prediction, probability), or None if the reading has no features
+    """
+    if engine_id not in _latest_features.index:
+        return None
+    
+    # Scale and predict
+    scaler = _model_data['scaler']
+    model = _model_data['model']
+    
+    X = _latest_features.loc[[engine_id]].values
+    if scaler is not None:
+        X = scaler.transform(X)
+    
+    prediction = int(model.predict(X)[0])
+    probability = float(model.predict_proba(X)[0][1])
+    
+    return prediction, probability
+
+
+@st.cache_data
+def predict_fleet(df, _engine_rows, _model_data):
+    """
+    Predict failure for every engine's latest reading in one batch
+    
+    Args:
+        df (pd.DataFrame): Sensor data sorted by engine and time
+        _engine_rows (dict): engine_id -> (start, stop) row range in df
+        _model_data (dict): Loaded model bundle
+        
+    Returns:
+        np.ndarray: Predicted class of each engine whose latest reading has features
+    """
+    # One scaler.transform + predict call for the whole fleet (tree models
+    # trained without scaling have no scaler)
+    X = latest_engine_features(df, _engine_rows, _model_data).values
+    if _model_data['scaler'] is not None:
+        X = _model_data['scaler'].transform(X)
+    return _model_data['model'].predict(X)
+
+
+def decimate(data, max_points=500):
+    """
+    Downsample a time series to at most max_points rows for plotting
+    
+    Readings are averaged into equal time buckets, so the browser only has to
+    draw a fixed number of points however dense the sensor data is.
+    
+    Args:
+        data (pd.DataFrame): Readings with a 'timestamp' column, sorted by time
+        max_points (int): Maximum number of rows to return
+        
+    Returns:
+        pd.DataFrame: data itself if small enough, otherwise bucket means
+    """
+    if len(data) <= max_points:
+        return data
+    
+    # Buckets start at the first reading; a width just over span / max_points
+    # puts the last reading in bucket max_points - 1 at the latest
+    span = data['timestamp'].iloc[-1] - data['timestamp'].iloc[0]
+    bucket = span // max_points + pd.Timedelta(1, unit=span.unit)
+    
+    return (data.set_index('timestamp')
+                .resample(bucket, origin='start')
+                .mean(numeric_only=True)
+                .dropna()
+                .reset_index())
+
+
+def histogram_bar(values, name, color, bins=30):
+    """
+    Create a histogram trace from counts binned server-side
+    
+    Only the bin counts are sent to the browser, instead of every raw value
+    for Plotly to bin client-side.
+    
+    Args:
+        values (pd.Series): Values to bin
+        name (str): Trace name
+        color (str): Bar color
+        bins (int): Number of equal-width bins
+        
+    Returns:
+        go.Bar: Bars spanning each bin
+    """
+    # NaN readings would make the autodetected bin range non-finite
+    counts, edges = np.histogram(values.dropna().to_numpy(), bins=bins)
+    
+    return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                  name=name, marker_color=color)
 
 
 def create_sensor_gauge(value, title, min_val, max_val, threshold_warning, threshold_danger):
@@ -153,7 +363,7 @@ def main():
     
     # Load model and data
     model_data = load_model()
-    df = load_data()
+    df, engine_rows = load_data()
     
     if model_data is None or df is None:
         st.error("⚠️ Model or data not found!")
@@ -175,16 +385,16 @@ def main():
     
     # Different pages
     if page == "Real-Time Monitoring":
-        show_realtime_monitoring(df, model_data)
+        show_realtime_monitoring(df, engine_rows, model_data)
     elif page == "Fleet Overview":
-        show_fleet_overview(df, model_data)
+        show_fleet_overview(df, engine_rows, model_data)
     elif page == "ROI Calculator":
         show_roi_calculator()
     elif page == "Model Performance":
         show_model_performance()
 
 
-def show_realtime_monitoring(df, model_data):
+def show_realtime_monitoring(df, engine_rows, model_data):
     """Real-time engine monitoring page"""
     
     st.header("🔍 Real-Time Engine Monitoring")
@@ -192,34 +402,20 @@ def show_realtime_monitoring(df, model_data):
     # Engine selector
     engine_id = st.selectbox(
         "Select Engine ID",
-        options=sorted(df['engine_id'].unique())
+        options=list(engine_rows)
     )
     
-    # Get latest data for selected engine
-    engine_data = df[df['engine_id'] == engine_id].sort_values('timestamp')
+    # Get data for selected engine (already sorted by timestamp)
+    start, stop = engine_rows[engine_id]
+    engine_data = df.iloc[start:stop]
     latest = engine_data.iloc[-1]
     
-    # Make prediction
-    feature_engineer = model_data['feature_engineer']
+    # Make prediction (cached until the engine receives a new reading)
+    latest_features = latest_engine_features(df, engine_rows, model_data)
+    result = predict_engine(engine_id, latest['timestamp'], latest_features, model_data)
     
-    # Prepare features (simulate with latest reading)
-    temp_df = engine_data.tail(50).copy()  # Use last 50 readings for rolling features
-    temp_df = feature_engineer.prepare_features(temp_df)
-    
-    if len(temp_df) > 0:
-        # Get features
-        exclude_cols = ['timestamp', 'engine_id', 'failure']
-        feature_cols = [col for col in temp_df.columns if col not in exclude_cols]
-        
-        # Scale and predict
-        scaler = model_data['scaler']
-        model = model_data['model']
-        
-        X = temp_df[feature_cols].iloc[-1:].values
-        X_scaled = scaler.transform(X)
-        
-        prediction = model.predict(X_scaled)[0]
-        probability = model.predict_proba(X_scaled)[0][1]
+    if result is not None:
+        prediction, probability = result
         
         # Display prediction
         col1, col2, col3 = st.columns(3)
@@ -284,8 +480,8 @@ def show_realtime_monitoring(df, model_data):
     # Historical trends
     st.subheader("📈 Historical Trends (Last 7 Days)")
     
-    # Get last 7 days of data
-    recent_data = engine_data.tail(24 * 7)
+    # Get last 7 days of data, capped to a fixed number of plotted points
+    recent_data = decimate(engine_data.tail(24 * 7))
     
     # Create subplots
     fig = make_subplots(
@@ -321,15 +517,13 @@ def show_realtime_monitoring(df, model_data):
     st.plotly_chart(fig, use_container_width=True)
 
 
-def show_fleet_overview(df, model_data):
+def show_fleet_overview(df, engine_rows, model_data):
     """Fleet-wide overview page"""
     
     st.header("🚛 Fleet Overview")
     
     # Fleet statistics
-    total_engines = df['engine_id'].nunique()
-    total_readings = len(df)
-    avg_operating_hours = df.groupby('engine_id')['operating_hours'].max().mean()
+    total_engines, total_readings, avg_operating_hours = compute_fleet_stats(df)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -343,12 +537,8 @@ def show_fleet_overview(df, model_data):
     # Failure prediction summary
     st.subheader("⚠️ Failure Risk Assessment")
     
-    # Get latest reading per engine and make predictions
-    latest_per_engine = df.sort_values('timestamp').groupby('engine_id').tail(50)
-    
-    # This is simplified - in production you'd properly engineer features for each engine
-    failure_counts = df.groupby('engine_id')['failure'].max().sum()
-    at_risk_engines = int(failure_counts)
+    # Model prediction on each engine's latest reading
+    at_risk_engines = int((predict_fleet(df, engine_rows, model_data) == 1).sum())
     
     col1, col2 = st.columns(2)
     
@@ -364,7 +554,7 @@ def show_fleet_overview(df, model_data):
     st.markdown("---")
     st.subheader("📊 Fleet-Wide Sensor Averages")
     
-    latest_readings = df.sort_values('timestamp').groupby('engine_id').tail(1)
+    latest_readings = get_latest_readings(df)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -384,26 +574,22 @@ def show_fleet_overview(df, model_data):
     )
     
     fig.add_trace(
-        go.Histogram(x=latest_readings['temperature'], name='Temperature', 
-                    marker_color='red', nbinsx=30),
+        histogram_bar(latest_readings['temperature'], name='Temperature', color='red'),
         row=1, col=1
     )
     
     fig.add_trace(
-        go.Histogram(x=latest_readings['pressure'], name='Pressure', 
-                    marker_color='blue', nbinsx=30),
+        histogram_bar(latest_readings['pressure'], name='Pressure', color='blue'),
         row=1, col=2
     )
     
     fig.add_trace(
-        go.Histogram(x=latest_readings['vibration'], name='Vibration', 
-                    marker_color='orange', nbinsx=30),
+        histogram_bar(latest_readings['vibration'], name='Vibration', color='orange'),
         row=2, col=1
     )
     
     fig.add_trace(
-        go.Histogram(x=latest_readings['oil_quality'], name='Oil Quality', 
-                    marker_color='green', nbinsx=30),
+        histogram_bar(latest_readings['oil_quality'], name='Oil Quality', color='green'),
         row=2, col=2
     )
     
@@ -462,20 +648,20 @@ def show_roi_calculator():
         
         # Display results
         st.markdown('<div class="success-box">', unsafe_allow_html=True)
-        st.markdown(f"### Annual Net Savings: ${roi_metrics['net_savings']:,.0f}")
+        st.markdown(f"### Annual Net Savings: ${roi_metrics.net_savings:,.0f}")
         st.markdown('</div>', unsafe_allow_html=True)
         
         col2a, col2b = st.columns(2)
         
         with col2a:
-            st.metric("ROI", f"{roi_metrics['roi_percentage']:.1f}%")
+            st.metric("ROI", f"{roi_metrics.roi_percentage:.1f}%")
             st.metric("Failures Prevented", f"{prevented_failures}")
         
         with col2b:
-            payback = roi_metrics['payback_period']
+            payback = roi_metrics.payback_period
             payback_str = f"{payback:.1f} years" if payback < float('inf') else "N/A"
             st.metric("Payback Period", payback_str)
-            st.metric("Total Failure Cost Avoided", f"${roi_metrics['total_failure_cost']:,.0f}")
+            st.metric("Total Failure Cost Avoided", f"${roi_metrics.total_failure_cost:,.0f}")
         
         st.markdown("---")
         
@@ -485,9 +671,9 @@ def show_roi_calculator():
         breakdown_data = pd.DataFrame({
             'Category': ['Failure Costs Avoided', 'Maintenance Costs', 'Net Savings'],
             'Amount': [
-                roi_metrics['total_failure_cost'],
-                roi_metrics['maintenance_cost'],
-                roi_metrics['net_savings']
+                roi_metrics.total_failure_cost,
+                roi_metrics.maintenance_cost,
+                roi_metrics.net_savings
             ]
         })
         
@@ -506,18 +692,12 @@ def show_roi_calculator():
     st.markdown("---")
     st.subheader("📈 5-Year Financial Projection")
     
-    years = list(range(1, 6))
-    cumulative_savings = []
-    cumulative_investment = []
-    
-    for year in years:
-        cumulative_savings.append(roi_metrics['net_savings'] * year)
-        cumulative_investment.append(initial_investment if year == 1 else initial_investment)
+    years = np.arange(1, 6)
     
     projection_df = pd.DataFrame({
         'Year': years,
-        'Cumulative Savings': cumulative_savings,
-        'Initial Investment': cumulative_investment
+        'Cumulative Savings': roi_metrics.net_savings * years,
+        'Initial Investment': np.full(len(years), initial_investment)
     })
     
     fig = go.Figure()
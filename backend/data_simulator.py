@@ -5,11 +5,31 @@ Generates realistic sensor data for predictive maintenance training
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from joblib import Parallel, delayed
 from datetime import datetime, timedelta
 import os
+from numba import njit
 
-# Set random seed for reproducibility
-np.random.seed(42)
+
+@njit(cache=True, nogil=True, fastmath=True)
+def apply_degradation(buf, start, slope, noise_scale):
+    """
+    Turn unit noise into a degrading sensor signal in place
+    buf[i] = start + slope * t + noise_scale * buf[i], with t going linearly from 0 to 1
+    
+    Args:
+        buf (ndarray): Unit noise samples, overwritten with the signal
+        start (float): Signal level at the start of the lifecycle
+        slope (float): Total change of the level over the lifecycle
+        noise_scale (float): Multiplier applied to the noise
+    """
+    n = buf.size
+    step = slope / (n - 1) if n > 1 else 0.0
+    for i in range(n):
+        buf[i] = start + step * i + noise_scale * buf[i]
 
 
 class EngineSensorSimulator:
@@ -22,117 +42,208 @@ class EngineSensorSimulator:
     - Operating Hours
     """
     
-    def __init__(self, num_engines=100, days=365):
+    # Probability of each engine fate: normal, gradual degradation, sudden failure
+    FATE_PROBABILITIES = (0.7, 0.2, 0.1)
+    
+    def __init__(self, num_engines=100, days=365, seed=42):
         """
         Initialize the simulator
         
         Args:
             num_engines (int): Number of engines to simulate
             days (int): Number of days of operation to simulate
+            seed (int): Random seed for reproducibility
         """
         self.num_engines = num_engines
         self.days = days
         self.readings_per_day = 24  # Hourly readings
+        self.seed = seed
+    
+    @staticmethod
+    def fill_normal(rng, buf, mean, std):
+        """Fill buf in place with normally distributed samples"""
+        rng.standard_normal(dtype=buf.dtype, out=buf)
+        buf *= std
+        buf += mean
+    
+    @staticmethod
+    def fill_exponential(rng, buf, scale):
+        """Fill buf in place with exponentially distributed samples"""
+        rng.standard_exponential(dtype=buf.dtype, out=buf)
+        buf *= scale
         
-    def generate_normal_operation(self, size):
+    def generate_normal_operation(self, out, rng):
         """Generate sensor data for normal operating conditions"""
-        data = {
-            'temperature': np.random.normal(75, 5, size),  # Mean 75°C, SD 5
-            'pressure': np.random.normal(40, 3, size),     # Mean 40 PSI, SD 3
-            'vibration': np.random.normal(2.0, 0.5, size), # Mean 2.0 mm/s, SD 0.5
-            'oil_quality': np.clip(100 - np.random.exponential(2, size), 40, 100),  # Degrades slowly
-            'failure': 0
-        }
-        return data
+        self.fill_normal(rng, out['temperature'], 75, 5)   # Mean 75°C, SD 5
+        self.fill_normal(rng, out['pressure'], 40, 3)      # Mean 40 PSI, SD 3
+        self.fill_normal(rng, out['vibration'], 2.0, 0.5)  # Mean 2.0 mm/s, SD 0.5
+        
+        # Degrades slowly
+        oil = out['oil_quality']
+        self.fill_exponential(rng, oil, 2)
+        np.subtract(100, oil, out=oil)
+        np.clip(oil, 40, 100, out=oil)
+        
+        out['failure'][:] = 0
     
-    def generate_degrading_operation(self, size):
+    def generate_degrading_operation(self, out, rng):
         """Generate sensor data showing gradual degradation leading to failure"""
-        # Create degradation pattern over time
-        degradation_factor = np.linspace(0, 1, size)
-        
-        data = {
-            'temperature': 75 + degradation_factor * 40 + np.random.normal(0, 5, size),
-            'pressure': 40 + degradation_factor * 20 + np.random.normal(0, 4, size),
-            'vibration': 2.0 + degradation_factor * 8 + np.random.normal(0, 1, size),
-            'oil_quality': 100 - degradation_factor * 70 - np.random.exponential(5, size),
-            'failure': 0
-        }
+        size = out['failure'].size
+        
+        # Draw unit noise, then scale it and add the degradation trend in one
+        # compiled pass per sensor
+        temperature = out['temperature']
+        rng.standard_normal(dtype=temperature.dtype, out=temperature)
+        apply_degradation(temperature, 75, 40, 5)
+        
+        pressure = out['pressure']
+        rng.standard_normal(dtype=pressure.dtype, out=pressure)
+        apply_degradation(pressure, 40, 20, 4)
+        
+        vibration = out['vibration']
+        rng.standard_normal(dtype=vibration.dtype, out=vibration)
+        apply_degradation(vibration, 2.0, 8, 1)
+        
+        oil = out['oil_quality']
+        rng.standard_exponential(dtype=oil.dtype, out=oil)
+        apply_degradation(oil, 100, -70, -5)
         
         # Mark last 10% of readings as failure imminent
         failure_threshold = int(size * 0.9)
-        data['failure'] = np.zeros(size)
-        data['failure'][failure_threshold:] = 1
-        
-        return data
+        out['failure'][:failure_threshold] = 0
+        out['failure'][failure_threshold:] = 1
     
-    def generate_sudden_failure(self, size):
+    def generate_sudden_failure(self, out, rng):
         """Generate sensor data showing sudden failure patterns"""
+        size = out['failure'].size
+        
         # Normal operation with sudden spike
         failure_point = int(size * 0.8)
+        before, after = slice(None, failure_point), slice(failure_point, None)
         
-        data = {
-            'temperature': np.concatenate([
-                np.random.normal(75, 5, failure_point),
-                np.random.normal(120, 10, size - failure_point)
-            ]),
-            'pressure': np.concatenate([
-                np.random.normal(40, 3, failure_point),
-                np.random.normal(65, 8, size - failure_point)
-            ]),
-            'vibration': np.concatenate([
-                np.random.normal(2.0, 0.5, failure_point),
-                np.random.normal(12, 3, size - failure_point)
-            ]),
-            'oil_quality': np.concatenate([
-                np.clip(100 - np.random.exponential(2, failure_point), 40, 100),
-                np.random.uniform(10, 30, size - failure_point)
-            ]),
-            'failure': 0
-        }
+        self.fill_normal(rng, out['temperature'][before], 75, 5)
+        self.fill_normal(rng, out['temperature'][after], 120, 10)
         
-        data['failure'] = np.zeros(size)
-        data['failure'][failure_point:] = 1
+        self.fill_normal(rng, out['pressure'][before], 40, 3)
+        self.fill_normal(rng, out['pressure'][after], 65, 8)
         
-        return data
+        self.fill_normal(rng, out['vibration'][before], 2.0, 0.5)
+        self.fill_normal(rng, out['vibration'][after], 12, 3)
+        
+        oil_before = out['oil_quality'][before]
+        self.fill_exponential(rng, oil_before, 2)
+        np.subtract(100, oil_before, out=oil_before)
+        np.clip(oil_before, 40, 100, out=oil_before)
+        
+        oil_after = out['oil_quality'][after]
+        rng.random(dtype=oil_after.dtype, out=oil_after)
+        oil_after *= 20
+        oil_after += 10  # Uniform between 10 and 30
+        
+        out['failure'][before] = 0
+        out['failure'][after] = 1
     
-    def simulate_engine_lifecycle(self, engine_id):
+    def simulate_engine_lifecycle(self, engine_id, fate, out, rng):
         """
         Simulate complete lifecycle of a single engine
         
-        Returns:
-            DataFrame with sensor readings for one engine
+        Args:
+            engine_id (int): Engine identifier
+            fate (int): 0 = normal, 1 = gradual degradation, 2 = sudden failure
+            out (dict): Column arrays of length days * readings_per_day,
+                filled in place with this engine's sensor readings
+            rng (Generator): Random generator owned by this engine
         """
         total_readings = self.days * self.readings_per_day
         
-        # Randomly decide engine fate
-        fate = np.random.choice(['normal', 'gradual_degradation', 'sudden_failure'], 
-                               p=[0.7, 0.2, 0.1])
-        
-        if fate == 'normal':
-            data = self.generate_normal_operation(total_readings)
-        elif fate == 'gradual_degradation':
-            data = self.generate_degrading_operation(total_readings)
-        else:
-            data = self.generate_sudden_failure(total_readings)
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
+        # Generate sensor readings for the engine's fate directly into the output slices
+        generators = (
+            self.generate_normal_operation,
+            self.generate_degrading_operation,
+            self.generate_sudden_failure
+        )
+        generators[fate](out, rng)
         
         # Add metadata
-        df['engine_id'] = engine_id
-        df['operating_hours'] = np.arange(total_readings)
+        out['engine_id'][:] = engine_id
+        out['operating_hours'][:] = np.arange(total_readings)
         
         # Add timestamps
         start_date = datetime.now() - timedelta(days=self.days)
-        df['timestamp'] = [start_date + timedelta(hours=i) for i in range(total_readings)]
+        out['timestamp'][:] = pd.date_range(start_date, periods=total_readings, freq=timedelta(hours=1))
+        
+        # Ensure realistic bounds, clipping in place
+        np.clip(out['temperature'], 50, 150, out=out['temperature'])
+        np.clip(out['pressure'], 20, 80, out=out['pressure'])
+        np.clip(out['vibration'], 0, 20, out=out['vibration'])
+        np.clip(out['oil_quality'], 0, 100, out=out['oil_quality'])
+    
+    def simulate_engines(self, engine_ids, engine_fates, engine_rngs):
+        """
+        Simulate a group of engines into freshly allocated column arrays
+        
+        Args:
+            engine_ids (range): Engines to simulate, in output order
+            engine_fates (ndarray): Fate code of every engine of the fleet
+            engine_rngs (list): Random generator for every engine of the fleet
+            
+        Returns:
+            dict: Column name -> array holding the engines' readings back to back
+        """
+        # Preallocate one contiguous array per column for the group;
+        # each engine writes into its own slice, so no concat is needed
+        readings_per_engine = self.days * self.readings_per_day
+        total_readings = len(engine_ids) * readings_per_engine
+        columns = {
+            'timestamp': np.empty(total_readings, dtype='datetime64[ns]'),
+            'engine_id': np.empty(total_readings, dtype=np.int16),
+            'operating_hours': np.empty(total_readings, dtype=np.int32),
+            'temperature': np.empty(total_readings, dtype=np.float32),
+            'pressure': np.empty(total_readings, dtype=np.float32),
+            'vibration': np.empty(total_readings, dtype=np.float32),
+            'oil_quality': np.empty(total_readings, dtype=np.float32),
+            'failure': np.empty(total_readings, dtype=np.int8)
+        }
+        
+        # Fill the slices on a thread pool. NumPy releases the GIL while
+        # filling arrays, and threads can write straight into the shared buffers.
+        def simulate(position, engine_id):
+            start = position * readings_per_engine
+            engine_slice = slice(start, start + readings_per_engine)
+            self.simulate_engine_lifecycle(
+                engine_id,
+                engine_fates[engine_id],
+                {name: values[engine_slice] for name, values in columns.items()},
+                engine_rngs[engine_id]
+            )
         
-        # Ensure realistic bounds
-        df['temperature'] = np.clip(df['temperature'], 50, 150)
-        df['pressure'] = np.clip(df['pressure'], 20, 80)
-        df['vibration'] = np.clip(df['vibration'], 0, 20)
-        df['oil_quality'] = np.clip(df['oil_quality'], 0, 100)
+        Parallel(n_jobs=-1, prefer='threads')(
+            delayed(simulate)(position, engine_id) for position, engine_id in enumerate(engine_ids)
+        )
         
-        return df
+        return columns
+    
+    def draw_engine_fates(self):
+        """
+        Randomly decide every engine's fate in one vectorized draw
+        
+        Returns:
+            ndarray: Fate code per engine (see simulate_engine_lifecycle)
+        """
+        rng = np.random.default_rng(self.seed)
+        return rng.choice(len(self.FATE_PROBABILITIES), size=self.num_engines,
+                          p=self.FATE_PROBABILITIES)
+    
+    def spawn_engine_rngs(self):
+        """
+        Give each engine its own generator spawned from the simulator seed,
+        so results are reproducible regardless of scheduling or batching
+        
+        Returns:
+            list: One Generator per engine
+        """
+        engine_seeds = np.random.SeedSequence(self.seed).spawn(self.num_engines)
+        return [np.random.default_rng(engine_seed) for engine_seed in engine_seeds]
     
     def generate_dataset(self):
         """
@@ -143,28 +254,126 @@ class EngineSensorSimulator:
         """
         print(f"Generating sensor data for {self.num_engines} engines over {self.days} days...")
         
-        all_data = []
-        for engine_id in range(self.num_engines):
-            if (engine_id + 1) % 10 == 0:
-                print(f"  Generated data for {engine_id + 1}/{self.num_engines} engines")
-            
-            engine_data = self.simulate_engine_lifecycle(engine_id)
-            all_data.append(engine_data)
-        
-        # Combine all engines
-        dataset = pd.concat(all_data, ignore_index=True)
+        columns = self.simulate_engines(
+            range(self.num_engines), self.draw_engine_fates(), self.spawn_engine_rngs()
+        )
         
-        # Reorder columns
-        dataset = dataset[['timestamp', 'engine_id', 'operating_hours', 
-                          'temperature', 'pressure', 'vibration', 'oil_quality', 'failure']]
+        # Wrap the filled arrays once, already in output column order
+        dataset = pd.DataFrame(columns, copy=False)
         
         print(f"\nDataset generated successfully!")
         print(f"Total records: {len(dataset):,}")
         print(f"Failure records: {dataset['failure'].sum():,} ({dataset['failure'].mean()*100:.2f}%)")
         
         return dataset
+    
+    def write_dataset(self, output_path, csv_path=None, engines_per_batch=25):
+        """
+        Generate the dataset straight into a Parquet file (and optionally a
+        CSV), one batch of engines at a time, so memory use is bounded by the
+        batch rather than the fleet
+        
+        Produces the same rows as generate_dataset(). Summary statistics are
+        accumulated batch by batch, so the files never need to be read back.
+        
+        Args:
+            output_path (str): Parquet file to write
+            csv_path (str): Optional CSV file to write alongside
+            engines_per_batch (int): Engines simulated and written per row group
+            
+        Returns:
+            tuple: (DataFrame of count/mean/std/min/max per numeric column,
+                number of engines with at least one failure reading)
+        """
+        print(f"Streaming sensor data for {self.num_engines} engines over {self.days} days to {output_path}...")
+        
+        engine_fates = self.draw_engine_fates()
+        engine_rngs = self.spawn_engine_rngs()
+        parquet_writer = None
+        csv_writer = None
+        stats = None
+        engines_with_failures = 0
+        
+        try:
+            for first in range(0, self.num_engines, engines_per_batch):
+                engine_ids = range(first, min(first + engines_per_batch, self.num_engines))
+                columns = self.simulate_engines(engine_ids, engine_fates, engine_rngs)
+                batch = pa.Table.from_pydict(columns)
+                
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(output_path, batch.schema, compression='zstd')
+                parquet_writer.write_table(batch)
+                
+                if csv_path is not None:
+                    # Microsecond timestamps, as pandas writes them
+                    csv_batch = batch.set_column(
+                        0, 'timestamp', batch.column('timestamp').cast(pa.timestamp('us'))
+                    )
+                    if csv_writer is None:
+                        csv_writer = pacsv.CSVWriter(
+                            csv_path, csv_batch.schema,
+                            write_options=pacsv.WriteOptions(quoting_style='none')
+                        )
+                    csv_writer.write_table(csv_batch)
+                
+                # Engines never span batches, so per-batch failure counts add up
+                engines_with_failures += np.unique(columns['engine_id'][columns['failure'] > 0]).size
+                stats = merge_moments(stats, batch_moments(columns))
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+            if csv_writer is not None:
+                csv_writer.close()
+        
+        count, mean, m2, minimum, maximum = stats
+        summary = pd.DataFrame(
+            [count, mean, np.sqrt(m2 / (count - 1)), minimum, maximum],
+            index=['count', 'mean', 'std', 'min', 'max'],
+            columns=[name for name in columns if name != 'timestamp']
+        )
+        return summary, engines_with_failures
 
 
+def batch_moments(columns):
+    """
+    Count, mean, sum of squared deviations, min and max of each numeric column
+    
+    Args:
+        columns (dict): Column name -> array, as returned by simulate_engines
+        
+    Returns:
+        tuple: Arrays with one entry per numeric column
+    """
+    values = np.stack([
+        values.astype(np.float64) for name, values in columns.items() if name != 'timestamp'
+    ])
+    mean = values.mean(axis=1)
+    m2 = ((values - mean[:, None]) ** 2).sum(axis=1)
+    count = np.full(len(values), values.shape[1], dtype=np.float64)
+    return count, mean, m2, values.min(axis=1), values.max(axis=1)
+
+
+def merge_moments(a, b):
+    """
+    Combine the batch_moments of two disjoint batches (Chan et al. update)
+    
+    Args:
+        a (tuple): Moments so far, or None
+        b (tuple): Moments of the next batch
+        
+    Returns:
+        tuple: Moments of both batches together
+    """
+    if a is None:
+        return b
+    count_a, mean_a, m2_a, min_a, max_a = a
+    count_b, mean_b, m2_b, min_b, max_b = b
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta ** 2 * count_a * count_b / count
+    return count, mean, m2, np.minimum(min_a, min_b), np.maximum(max_a, max_b)
+
 def main():
     """Main function to generate and save sensor data"""
     
@@ -174,28 +383,28 @@ def main():
     # Initialize simulator
     simulator = EngineSensorSimulator(num_engines=100, days=365)
     
-    # Generate dataset
-    dataset = simulator.generate_dataset()
-    
-    # Save to CSV
+    # Stream the dataset to a typed, compressed Parquet file and the CSV,
+    # engine batch by engine batch, collecting statistics on the way
+    parquet_path = 'data/sensor_data.parquet'
     output_path = 'data/sensor_data.csv'
-    dataset.to_csv(output_path, index=False)
-    print(f"\nData saved to: {output_path}")
+    summary, engines_with_failures = simulator.write_dataset(parquet_path, csv_path=output_path)
+    print(f"\nData saved to: {parquet_path}")
+    print(f"Data saved to: {output_path}")
     
     # Display sample statistics
     print("\n" + "="*60)
     print("DATASET STATISTICS")
     print("="*60)
-    print(dataset.describe())
+    print(summary)
     
+    # Only the first row group is read back for the sample
     print("\n" + "="*60)
     print("SAMPLE DATA")
     print("="*60)
-    print(dataset.head(10))
+    first_rows = next(pq.ParquetFile(parquet_path).iter_batches(batch_size=10))
+    print(first_rows.to_pandas())
     
     # Show failure distribution by engine
-    failure_by_engine = dataset.groupby('engine_id')['failure'].sum()
-    engines_with_failures = (failure_by_engine > 0).sum()
     print(f"\nEngines with predicted failures: {engines_with_failures}/{simulator.num_engines}")
 
 
@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration for the Predictive Maintenance API
+Loads data and model once in the master process so workers share them
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5002')}"
+
+# One worker per core; each worker serves requests on a small thread pool
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import the app before forking so df, indices and predictions are
+# built once and shared copy-on-write by every worker
+preload_app = True
+
+
+def when_ready(server):
+    """Load model and data in the master after the app is imported"""
+    import api
+    api.load_resources()
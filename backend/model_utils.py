@@ -7,9 +7,113 @@ import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
+from sklearn.metrics import roc_auc_score, roc_curve
 import matplotlib.pyplot as plt
 import seaborn as sns
+from numba import njit
+
+# Compact column dtypes of the sensor data files, shared by the loader, API,
+# dashboard and training: sensors need far less than float64 precision, and
+# halving the bytes halves the memory traffic of every fleet-wide scan
+SENSOR_DTYPES = {
+    'engine_id': 'int16',
+    'operating_hours': 'int32',
+    'temperature': 'float32',
+    'pressure': 'float32',
+    'vibration': 'float32',
+    'oil_quality': 'float32',
+    'failure': 'int8'
+}
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean_std_diff(values, starts, ends, window):
+    """
+    Trailing rolling mean/std and first difference of each sensor, per engine
+    
+    Windows hold up to `window` readings of one engine (fewer at the start,
+    like min_periods=1). Sums are updated as readings enter and leave the
+    window (Kahan sum for the mean, Welford for the variance, as pandas
+    does), so the cost is independent of the window size. NaNs are skipped.
+    
+    Args:
+        values (ndarray): (n_sensors, n_rows) readings, rows grouped by engine
+            in time order
+        starts (ndarray): First row of each engine
+        ends (ndarray): One past the last row of each engine
+        window (int): Rolling window length in readings
+        
+    Returns:
+        tuple: (mean, std, diff) shaped like values; mean and std are float64
+            with std 0 for single-reading windows, diff keeps the input dtype
+            and is 0 on each engine's first reading
+    """
+    n_sensors, n_rows = values.shape
+    mean = np.empty((n_sensors, n_rows))
+    std = np.empty((n_sensors, n_rows))
+    diff = np.empty_like(values)
+    
+    for e in range(starts.size):
+        for s in range(n_sensors):
+            x = values[s]
+            nobs = 0
+            sum_x = 0.0
+            sum_comp = 0.0
+            mean_x = 0.0
+            ssqdm_x = 0.0
+            same_run = 0
+            prev = np.nan
+            
+            for i in range(starts[e], ends[e]):
+                # Reading entering the window
+                val = float(x[i])
+                if val == val:
+                    same_run = same_run + 1 if val == prev else 1
+                    prev = val
+                    nobs += 1
+                    y = val - sum_comp
+                    t = sum_x + y
+                    sum_comp = t - sum_x - y
+                    sum_x = t
+                    prev_mean = mean_x
+                    mean_x += (val - mean_x) / nobs
+                    ssqdm_x += (val - prev_mean) * (val - mean_x)
+                
+                # Reading leaving the window
+                if i - window >= starts[e]:
+                    old = float(x[i - window])
+                    if old == old:
+                        nobs -= 1
+                        y = -old - sum_comp
+                        t = sum_x + y
+                        sum_comp = t - sum_x - y
+                        sum_x = t
+                        if nobs:
+                            prev_mean = mean_x
+                            mean_x -= (old - mean_x) / nobs
+                            ssqdm_x -= (old - prev_mean) * (old - mean_x)
+                        else:
+                            mean_x = 0.0
+                            ssqdm_x = 0.0
+                
+                if nobs == 0:
+                    mean[s, i] = np.nan
+                    std[s, i] = 0.0
+                elif same_run >= nobs:
+                    # Constant window: exact, free of rounding drift
+                    mean[s, i] = prev
+                    std[s, i] = 0.0
+                else:
+                    mean[s, i] = sum_x / nobs
+                    std[s, i] = np.sqrt(max(ssqdm_x / (nobs - 1), 0.0))
+                
+                if i == starts[e]:
+                    diff[s, i] = 0
+                else:
+                    step = x[i] - x[i - 1]
+                    diff[s, i] = step if step == step else 0
+    
+    return mean, std, diff
 
 
 class FeatureEngineer:
@@ -32,33 +136,48 @@ class FeatureEngineer:
         Create time-based features from sensor data
         
         Args:
-            df (DataFrame): Input sensor data
+            df (DataFrame): Input sensor data (columns are added in place)
             
         Returns:
             DataFrame: Data with additional temporal features
         """
         print("Creating temporal features...")
-        df = df.copy()
         
-        # Sort by engine and timestamp
-        df = df.sort_values(['engine_id', 'timestamp'])
+        # Sort by engine and timestamp; callers usually pass data in that order
+        # already, which an O(n) check confirms much faster than re-sorting
+        engine_ids = df['engine_id'].to_numpy()
+        timestamps = df['timestamp'].to_numpy()
+        same_engine = engine_ids[1:] == engine_ids[:-1]
+        in_order = (engine_ids[1:] > engine_ids[:-1]) | (same_engine & (timestamps[1:] >= timestamps[:-1]))
+        if not in_order.all():
+            # Stable lexsort on the key arrays, engine_id as primary key; it
+            # runs in near-linear time on the mostly ordered data seen here
+            df = df.take(np.lexsort((timestamps, engine_ids)))
+            engine_ids = df['engine_id'].to_numpy()
+            same_engine = engine_ids[1:] == engine_ids[:-1]
+        
+        # Each engine's readings are now one contiguous run of rows, bounded
+        # wherever the engine_id changes
+        starts = np.flatnonzero(np.r_[True, ~same_engine])
+        ends = np.r_[starts[1:], len(df)]
+        
+        # One compiled pass per engine computes every statistic for all four
+        # sensors (one contiguous array per sensor)
+        sensor_cols = ['temperature', 'pressure', 'vibration', 'oil_quality']
+        values = np.ascontiguousarray(df[sensor_cols].to_numpy().T)
+        rolling_mean, rolling_std, rate_of_change = rolling_mean_std_diff(
+            values, starts, ends, self.window_size
+        )
         
-        # Rolling statistics (per engine)
-        for col in ['temperature', 'pressure', 'vibration', 'oil_quality']:
+        for i, col in enumerate(sensor_cols):
             # Rolling mean - captures trends
-            df[f'{col}_rolling_mean'] = df.groupby('engine_id')[col].transform(
-                lambda x: x.rolling(window=self.window_size, min_periods=1).mean()
-            )
+            df[f'{col}_rolling_mean'] = rolling_mean[i]
             
             # Rolling std - captures variability
-            df[f'{col}_rolling_std'] = df.groupby('engine_id')[col].transform(
-                lambda x: x.rolling(window=self.window_size, min_periods=1).std()
-            ).fillna(0)
+            df[f'{col}_rolling_std'] = rolling_std[i]
             
             # Rate of change - captures degradation speed
-            df[f'{col}_rate_of_change'] = df.groupby('engine_id')[col].transform(
-                lambda x: x.diff()
-            ).fillna(0)
+            df[f'{col}_rate_of_change'] = rate_of_change[i]
         
         return df
     
@@ -67,34 +186,33 @@ class FeatureEngineer:
         Create feature interactions that capture complex relationships
         
         Args:
-            df (DataFrame): Input sensor data
+            df (DataFrame): Input sensor data (columns are added in place)
             
         Returns:
             DataFrame: Data with interaction features
         """
         print("Creating interaction features...")
-        df = df.copy()
+        
+        # Work on the raw sensor arrays: no index alignment or intermediate
+        # Series for each arithmetic step
+        T, P, V, O = df[['temperature', 'pressure', 'vibration', 'oil_quality']].to_numpy().T
         
         # Temperature-Pressure ratio (high temp + high pressure = danger)
-        df['temp_pressure_ratio'] = df['temperature'] / (df['pressure'] + 1)
+        df['temp_pressure_ratio'] = T / (P + 1)
         
         # Vibration-Temperature interaction
-        df['vibration_temp_product'] = df['vibration'] * df['temperature']
+        df['vibration_temp_product'] = V * T
         
         # Health score (composite metric)
         df['health_score'] = (
-            (150 - df['temperature']) / 100 +  # Lower temp is better
-            df['oil_quality'] / 100 +           # Higher quality is better
-            (20 - df['vibration']) / 20 +       # Lower vibration is better
-            (80 - df['pressure']) / 80          # Lower pressure is better
-        ) / 4
+            (150 - T) / 100 +  # Lower temp is better
+            O / 100 +          # Higher quality is better
+            (20 - V) / 20 +    # Lower vibration is better
+            (80 - P) / 80      # Lower pressure is better
+        ) * 0.25
         
         # Stress indicator
-        df['stress_indicator'] = (
-            df['temperature'] / 150 +
-            df['pressure'] / 80 +
-            df['vibration'] / 20
-        ) / 3
+        df['stress_indicator'] = (T / 150 + P / 80 + V / 20) / 3
         
         return df
     
@@ -106,8 +224,12 @@ class FeatureEngineer:
             df (DataFrame): Raw sensor data
             
         Returns:
-            DataFrame: Engineered features ready for ML
+            DataFrame: Engineered features ready for ML (the input is not modified)
         """
+        # The stages only add columns, so a shallow copy keeps the caller's
+        # frame untouched without duplicating its data
+        df = df.copy(deep=False)
+        
         df = self.create_temporal_features(df)
         df = self.create_interaction_features(df)
         
@@ -123,6 +245,58 @@ class ModelEvaluator:
     Model evaluation and visualization utilities
     """
     
+    @staticmethod
+    def binary_classification_report(tn, fp, fn, tp, target_names=('Normal', 'Failure'), digits=2):
+        """
+        Format the same table as sklearn's classification_report from the
+        four confusion-matrix counts of a binary problem
+        
+        Args:
+            tn, fp, fn, tp (int): Confusion-matrix counts
+            target_names: Names of the negative and positive class
+            digits (int): Decimal places of the scores
+            
+        Returns:
+            str: Report text
+        """
+        support = np.array([tn + fp, fn + tp])
+        predicted = np.array([tn + fn, fp + tp])
+        correct = np.array([tn, tp])
+        
+        # Undefined ratios (no predictions or no samples of a class) count as 0
+        precision = np.divide(correct, predicted, out=np.zeros(2), where=predicted > 0)
+        recall = np.divide(correct, support, out=np.zeros(2), where=support > 0)
+        denom = support + predicted
+        f1 = np.divide(2 * correct, denom, out=np.zeros(2), where=denom > 0)
+        
+        total = support.sum()
+        weights = support / total if total else np.zeros(2)
+        
+        # sklearn prints the supports as floats when no prediction is correct
+        if not correct.any():
+            support = support.astype(float)
+            total = float(total)
+        
+        width = max(len('weighted avg'), *(len(name) for name in target_names))
+        headers = ['precision', 'recall', 'f1-score', 'support']
+        row_fmt = '{:>{width}s} ' + ' {:>9.{digits}f}' * 3 + ' {:>9}\n'
+        
+        report = ('{:>{width}s} ' + ' {:>9}' * 4).format('', *headers, width=width) + '\n\n'
+        for name, p, r, f, n in zip(target_names, precision, recall, f1, support):
+            report += row_fmt.format(name, p, r, f, n, width=width, digits=digits)
+        report += '\n'
+        
+        accuracy = correct.sum() / total if total else 0.0
+        report += ('{:>{width}s} ' + ' {:>9.{digits}}' * 2 + ' {:>9.{digits}f} {:>9}\n').format(
+            'accuracy', '', '', accuracy, total, width=width, digits=digits
+        )
+        for name, avg_weights in [('macro avg', np.full(2, 0.5)), ('weighted avg', weights)]:
+            report += row_fmt.format(
+                name, precision @ avg_weights, recall @ avg_weights, f1 @ avg_weights, total,
+                width=width, digits=digits
+            )
+        return report
+    
     @staticmethod
     def print_metrics(y_true, y_pred, y_pred_proba):
         """
@@ -137,17 +311,20 @@ class ModelEvaluator:
         print("MODEL PERFORMANCE METRICS")
         print("="*60)
         
+        # Confusion matrix counts in one pass: each (true, predicted) pair
+        # maps to a bin 0-3 in tn, fp, fn, tp order
+        pairs = np.asarray(y_true, dtype=np.intp) * 2 + np.asarray(y_pred, dtype=np.intp)
+        tn, fp, fn, tp = np.bincount(pairs, minlength=4)
+        
         # Classification report
         print("\nClassification Report:")
-        print(classification_report(y_true, y_pred, 
-                                   target_names=['Normal', 'Failure']))
+        print(ModelEvaluator.binary_classification_report(tn, fp, fn, tp))
         
         # Confusion Matrix
-        cm = confusion_matrix(y_true, y_pred)
         print("\nConfusion Matrix:")
         print(f"{'':>15} {'Predicted Normal':>20} {'Predicted Failure':>20}")
-        print(f"{'Actual Normal':<15} {cm[0][0]:>20} {cm[0][1]:>20}")
-        print(f"{'Actual Failure':<15} {cm[1][0]:>20} {cm[1][1]:>20}")
+        print(f"{'Actual Normal':<15} {tn:>20} {fp:>20}")
+        print(f"{'Actual Failure':<15} {fn:>20} {tp:>20}")
         
         # ROC AUC
         try:
@@ -157,8 +334,6 @@ class ModelEvaluator:
             print("\nROC AUC Score: N/A")
         
         # Business metrics
-        tn, fp, fn, tp = cm.ravel()
-        
         print("\n" + "="*60)
         print("BUSINESS IMPACT METRICS")
         print("="*60)
@@ -191,7 +366,11 @@ class ModelEvaluator:
         
         # Get feature importances
         importances = model.feature_importances_
-        indices = np.argsort(importances)[::-1][:top_n]
+        top_n = min(top_n, len(importances))
+        
+        # Partition out the top_n in O(m), then sort only those
+        indices = np.argpartition(-importances, top_n - 1)[:top_n]
+        indices = indices[np.argsort(-importances[indices])]
         
         # Create plot
         plt.figure(figsize=(12, 8))
@@ -244,7 +423,7 @@ class ModelEvaluator:
             print(f"Could not plot ROC curve: {e}")
 
 
-def prepare_data_for_training(df, test_size=0.2):
+def prepare_data_for_training(df, test_size=0.2, scale=False):
     """
     Prepare data for ML training
     Time Complexity: O(n) - linear with dataset size
@@ -252,9 +431,12 @@ def prepare_data_for_training(df, test_size=0.2):
     Args:
         df (DataFrame): Engineered features dataset
         test_size (float): Proportion of data for testing
+        scale (bool): Standardize features; only scale-sensitive models
+            (e.g. linear ones) need it, tree models split the same either way
         
     Returns:
         tuple: X_train, X_test, y_train, y_test, feature_names, scaler
+            (scaler is None when scale is False)
     """
     print("\nPreparing data for training...")
     
@@ -262,8 +444,9 @@ def prepare_data_for_training(df, test_size=0.2):
     exclude_cols = ['timestamp', 'engine_id', 'failure']
     feature_cols = [col for col in df.columns if col not in exclude_cols]
     
-    # Separate features and target
-    X = df[feature_cols].values
+    # Separate features and target; float32 is what the trees split on
+    # internally anyway and halves the bytes every later step moves
+    X = df[feature_cols].to_numpy(dtype=np.float32)
     y = df['failure'].values
     
     print(f"Features: {len(feature_cols)}")
@@ -275,12 +458,18 @@ def prepare_data_for_training(df, test_size=0.2):
         X, y, test_size=test_size, random_state=42, stratify=y
     )
     
-    # Scale features (important for some algorithms)
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
+    # Scale features (important for some algorithms); the split arrays are
+    # our own copies, so scale them in place and keep them float32
+    scaler = None
+    if scale:
+        scaler = StandardScaler(copy=False)
+        X_train = scaler.fit_transform(X_train)
+        X_test = scaler.transform(X_test)
+        
+        # The saved scaler must not overwrite callers' arrays at prediction time
+        scaler.set_params(copy=True)
     
     print(f"Training samples: {len(X_train):,}")
     print(f"Testing samples: {len(X_test):,}")
     
-    return X_train_scaled, X_test_scaled, y_train, y_test, feature_cols, scaler
+    return X_train, X_test, y_train, y_test, feature_cols, scaler
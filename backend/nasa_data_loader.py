@@ -6,7 +6,65 @@ Loads and preprocesses real NASA turbofan engine data for predictive maintenance
 import numpy as np
 import pandas as pd
 import os
+import glob
+import hashlib
+import inspect
 from datetime import datetime, timedelta
+from numba import njit
+
+from model_utils import SENSOR_DTYPES
+
+
+@njit(cache=True, nogil=True)
+def engine_rul(codes, cycle, num_engines):
+    """
+    Remaining Useful Life of every row: its engine's max cycle minus its cycle
+    
+    Args:
+        codes (ndarray): Dense engine code (0..num_engines-1) per row
+        cycle (ndarray): Cycle number per row
+        num_engines (int): Number of distinct engines
+        
+    Returns:
+        ndarray: int32 RUL per row
+    """
+    max_cycle = np.full(num_engines, np.iinfo(np.int64).min, dtype=np.int64)
+    for i in range(codes.size):
+        if cycle[i] > max_cycle[codes[i]]:
+            max_cycle[codes[i]] = cycle[i]
+    
+    rul = np.empty(codes.size, dtype=np.int32)
+    for i in range(codes.size):
+        rul[i] = max_cycle[codes[i]] - cycle[i]
+    return rul
+
+
+@njit(cache=True, nogil=True)
+def mark_critical_failures(codes, rul, is_critical, failure_threshold, last_n):
+    """
+    Flag the last last_n rows with RUL <= failure_threshold of each critical engine
+    
+    Args:
+        codes (ndarray): Dense engine code per row
+        rul (ndarray): Remaining Useful Life per row
+        is_critical (ndarray): bool per engine code
+        failure_threshold (int): RUL at or below which a row may be flagged
+        last_n (int): Maximum number of flagged rows per engine
+        
+    Returns:
+        ndarray: int8 failure label per row
+    """
+    failure = np.zeros(codes.size, dtype=np.int8)
+    marked = np.zeros(is_critical.size, dtype=np.int64)
+    
+    # Walk backwards so each engine's last qualifying rows are found first
+    for i in range(codes.size - 1, -1, -1):
+        code = codes[i]
+        if is_critical[code] and rul[i] <= failure_threshold and marked[code] < last_n:
+            failure[i] = 1
+            marked[code] += 1
+    return failure
+
 
 class NASADataLoader:
     """
@@ -19,16 +77,25 @@ class NASADataLoader:
     - FD004: 248 train engines, 6 conditions, HPC & Fan degradation
     """
     
-    def __init__(self, dataset_name='FD001', nasa_folder='../datasets'):
+    # Columns the dashboard format is derived from (see normalize_to_dashboard_format)
+    REQUIRED_COLS = ['engine_id', 'cycle', 'sensor_3', 'sensor_7', 'sensor_8', 'sensor_17']
+    
+    def __init__(self, dataset_name='FD001', nasa_folder='../datasets', minimal=False, verbose=False):
         """
         Initialize NASA data loader
         
         Args:
             dataset_name: Which dataset to load (FD001, FD002, FD003, FD004)
             nasa_folder: Path to NASA data folder
+            minimal: Only keep REQUIRED_COLS instead of all 26 columns
+                (sensor selection then only sees those sensors)
+            verbose: Print progress and summary statistics; off by default so
+                repeated loads skip the formatting and the statistics passes
         """
         self.dataset_name = dataset_name
         self.nasa_folder = nasa_folder
+        self.minimal = minimal
+        self.verbose = verbose
         
         # Column names for NASA dataset (26 columns total)
         self.column_names = [
@@ -60,43 +127,87 @@ class NASADataLoader:
             'sensor_21'            # LPT coolant bleed (lbm/s)
         ]
         
+    def read_cmapss_file(self, path):
+        """
+        Parse a whitespace-delimited C-MAPSS train/test file
+        
+        The parsed frame is cached as Feather under <nasa_folder>/.cache and
+        reused while it is at least as new as the source file. The cache name
+        carries a hash of the parser code and column names, so changing
+        either re-parses instead of serving a stale frame.
+        
+        Args:
+            path: File to read
+            
+        Returns:
+            DataFrame with named, typed columns (REQUIRED_COLS only if minimal);
+            engine_id is categorical, so arithmetic on it must go through
+            .cat.categories / .cat.codes
+        """
+        columns = self.REQUIRED_COLS if self.minimal else None
+        stem = os.path.splitext(os.path.basename(path))[0]
+        version = hashlib.sha256(f"{PARSER_CODE_VERSION}{self.column_names}".encode()).hexdigest()[:16]
+        cache_path = os.path.join(self.nasa_folder, '.cache', f"{stem}.{version}.feather")
+        
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            return pd.read_feather(cache_path, columns=columns)
+        
+        # The files are purely numeric, so loadtxt parses them in one C loop
+        # without read_csv's setup; it also skips the trailing double spaces.
+        # Integers up to 2**24 are exact in float32, so the id/cycle cast is lossless
+        values = np.loadtxt(path, dtype=np.float32, ndmin=2)
+        df = pd.DataFrame(values, columns=self.column_names, copy=False)
+        df = df.astype({'engine_id': 'int32', 'cycle': 'int32'})
+        
+        # Few engines, many rows: categorical codes let groupby bucket by a
+        # dense integer range instead of hashing every engine_id
+        df['engine_id'] = df['engine_id'].astype('category')
+        
+        # Cache every column so both minimal and full loads can use it,
+        # replacing copies written by other parser versions
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            for stale_path in glob.glob(os.path.join(os.path.dirname(cache_path), f"{stem}.*feather")):
+                os.remove(stale_path)
+            df.to_feather(cache_path)
+        except OSError as e:
+            print(f"  Could not write {cache_path}: {e}")
+        
+        return df[columns] if columns else df
+    
     def load_train_data(self):
         """Load training data"""
         train_path = os.path.join(self.nasa_folder, f'train_{self.dataset_name}.txt')
         
-        print(f"Loading NASA {self.dataset_name} training data...")
-        df = pd.read_csv(train_path, sep=' ', header=None, 
-                        names=self.column_names, index_col=False)
+        if self.verbose:
+            print(f"Loading NASA {self.dataset_name} training data...")
+        df = self.read_cmapss_file(train_path)
         
-        # Remove trailing NaN columns (from double spaces in data)
-        df = df.dropna(axis=1, how='all')
-        
-        print(f"Loaded {len(df):,} records from {df['engine_id'].nunique()} engines")
+        if self.verbose:
+            print(f"Loaded {len(df):,} records from {df['engine_id'].nunique()} engines")
         return df
     
     def load_test_data(self):
         """Load test data"""
         test_path = os.path.join(self.nasa_folder, f'test_{self.dataset_name}.txt')
         
-        print(f"Loading NASA {self.dataset_name} test data...")
-        df = pd.read_csv(test_path, sep=' ', header=None,
-                        names=self.column_names, index_col=False)
-        
-        # Remove trailing NaN columns
-        df = df.dropna(axis=1, how='all')
+        if self.verbose:
+            print(f"Loading NASA {self.dataset_name} test data...")
+        df = self.read_cmapss_file(test_path)
         
-        print(f"Loaded {len(df):,} test records from {df['engine_id'].nunique()} engines")
+        if self.verbose:
+            print(f"Loaded {len(df):,} test records from {df['engine_id'].nunique()} engines")
         return df
     
     def load_rul_data(self):
         """Load Remaining Useful Life (RUL) data for test set"""
         rul_path = os.path.join(self.nasa_folder, f'RUL_{self.dataset_name}.txt')
         
-        rul_df = pd.read_csv(rul_path, sep=' ', header=None, names=['RUL'])
-        # Remove NaN if present
-        rul_df = rul_df.dropna()
+        # Whitespace separator absorbs the trailing space on every line
+        rul_df = pd.read_csv(rul_path, sep=r'\s+', header=None, names=['RUL'], dtype='int32')
         
-        print(f"Loaded RUL data for {len(rul_df)} test engines")
+        if self.verbose:
+            print(f"Loaded RUL data for {len(rul_df)} test engines")
         return rul_df
     
     def calculate_rul(self, df):
@@ -105,21 +216,14 @@ class NASADataLoader:
         RUL = max_cycle - current_cycle
         
         Args:
-            df: DataFrame with engine_id and cycle columns
+            df: DataFrame with engine_id and cycle columns (modified in place)
             
         Returns:
             DataFrame with RUL column added
         """
-        df = df.copy()
-        
-        # Get max cycle for each engine
-        max_cycles = df.groupby('engine_id')['cycle'].max()
-        
-        # Calculate RUL for each row
-        df['RUL'] = df.apply(
-            lambda row: max_cycles[row['engine_id']] - row['cycle'], 
-            axis=1
-        )
+        # One compiled pass for the per-engine max cycle, one for the subtraction
+        codes, engine_ids = pd.factorize(df['engine_id'])
+        df['RUL'] = engine_rul(codes, df['cycle'].to_numpy(dtype=np.int64), len(engine_ids))
         
         return df
     
@@ -132,15 +236,14 @@ class NASADataLoader:
         - 10-15% Critical/Failure Cases
         
         Args:
-            df: DataFrame with RUL column
+            df: DataFrame with RUL column (modified in place)
             failure_threshold: Cycles before failure to label as "failure imminent"
             
         Returns:
             DataFrame with failure column (0=normal, 1=failure imminent)
         """
-        df = df.copy()
-        
-        engine_ids = df['engine_id'].unique()
+        # Dense engine codes (0..E-1, in order of appearance) for array indexing
+        codes, engine_ids = pd.factorize(df['engine_id'])
         num_engines = len(engine_ids)
         
         # Realistic distribution
@@ -148,40 +251,41 @@ class NASADataLoader:
         num_degrading = int(num_engines * 0.18)  # 18% degrading/warning
         num_healthy = num_engines - num_critical - num_degrading  # 70% healthy
         
-        # Randomly select engines for each category
-        import numpy as np
-        np.random.seed(42)  # For reproducible results
+        # Randomly select engines for each category (local generator for
+        # reproducible results without touching global random state)
+        rng = np.random.default_rng(42)
         
-        critical_engines = np.random.choice(engine_ids, size=num_critical, replace=False)
-        remaining_engines = np.setdiff1d(engine_ids, critical_engines)
-        degrading_engines = np.random.choice(remaining_engines, size=num_degrading, replace=False)
+        # One draw of distinct engines, split into the two groups. Keep the
+        # default shuffle: without it the draw's order is not random, so the
+        # leading slice would favour some engines (it only shuffles the
+        # selected ids, not the fleet)
+        selected = rng.choice(num_engines, size=num_critical + num_degrading, replace=False)
         
-        # Initialize all as healthy
-        df['failure'] = 0
+        is_critical = np.zeros(num_engines, dtype=bool)
+        is_critical[selected[:num_critical]] = True
+        degrading_engines = engine_ids[selected[num_critical:]]
         
-        # Mark critical engines: their final records where RUL <= threshold
-        for engine_id in critical_engines:
-            engine_data = df[df['engine_id'] == engine_id]
-            final_low_rul = (engine_data['RUL'] <= failure_threshold)
-            if final_low_rul.any():
-                # Mark the last few cycles where RUL is critically low
-                low_rul_indices = engine_data[final_low_rul].tail(10).index
-                df.loc[low_rul_indices, 'failure'] = 1
+        # Mark critical engines: the last few cycles where RUL is critically low
+        # (all others stay healthy), in one compiled pass over the rows
+        df['failure'] = mark_critical_failures(
+            codes, df['RUL'].to_numpy(dtype=np.float64), is_critical, failure_threshold, 10
+        )
         
         # For degrading engines, keep them as 0 but they'll show in warning zone via sensor readings
         # This creates the "degrading" category without marking as failure
         
-        # Calculate statistics
-        failure_rate = df['failure'].mean() * 100
-        critical_count = df.groupby('engine_id')['failure'].max().sum()
-        degrading_count = num_degrading  # Engines in warning zone
-        healthy_count = num_healthy      # Completely healthy engines
-        
-        print(f"Engine health distribution:")
-        print(f"  - Healthy engines: {healthy_count} ({healthy_count/num_engines*100:.1f}%)")
-        print(f"  - Degrading engines: {degrading_count} ({degrading_count/num_engines*100:.1f}%)")
-        print(f"  - Critical engines: {critical_count} ({critical_count/num_engines*100:.1f}%)")
-        print(f"  - Overall failure rate: {failure_rate:.2f}%")
+        # Calculate statistics (only needed for the summary)
+        if self.verbose:
+            failure_rate = df['failure'].mean() * 100
+            critical_count = df.groupby('engine_id', observed=True, sort=False)['failure'].max().sum()
+            degrading_count = num_degrading  # Engines in warning zone
+            healthy_count = num_healthy      # Completely healthy engines
+            
+            print(f"Engine health distribution:")
+            print(f"  - Healthy engines: {healthy_count} ({healthy_count/num_engines*100:.1f}%)")
+            print(f"  - Degrading engines: {degrading_count} ({degrading_count/num_engines*100:.1f}%)")
+            print(f"  - Critical engines: {critical_count} ({critical_count/num_engines*100:.1f}%)")
+            print(f"  - Overall failure rate: {failure_rate:.2f}%")
         
         return df
     
@@ -194,27 +298,26 @@ class NASADataLoader:
             df: Full DataFrame
             
         Returns:
-            DataFrame with only variable sensors
+            New DataFrame with only variable sensors
         """
-        df = df.copy()
-        
         # Check variability of each sensor
         sensor_cols = [col for col in df.columns if col.startswith('sensor_')]
         
-        # Keep sensors with std > 0 (variable sensors)
-        variable_sensors = []
-        for col in sensor_cols:
-            if df[col].std() > 0.01:
-                variable_sensors.append(col)
+        # Keep sensors with std > 0 (variable sensors); one column-wise reduction
+        # over the sensor block, accumulated in float64 so near-constant
+        # high-magnitude sensors (e.g. ~2388 rpm) are measured accurately
+        stds = df[sensor_cols].to_numpy().std(axis=0, ddof=1, dtype=np.float64)
+        variable_sensors = [col for col, std in zip(sensor_cols, stds) if std > 0.01]
         
         # Keep metadata and variable sensors
         keep_cols = ['engine_id', 'cycle', 'RUL', 'failure'] + variable_sensors
         keep_cols = [col for col in keep_cols if col in df.columns]
         
-        df = df[keep_cols]
+        df = df.reindex(columns=keep_cols)
         
-        print(f"Selected {len(variable_sensors)} variable sensors (out of 21)")
-        print(f"Variable sensors: {variable_sensors}")
+        if self.verbose:
+            print(f"Selected {len(variable_sensors)} variable sensors (out of 21)")
+            print(f"Variable sensors: {variable_sensors}")
         
         return df
     
@@ -224,25 +327,21 @@ class NASADataLoader:
         Assumes 1 cycle = 1 hour
         
         Args:
-            df: DataFrame with cycle column
+            df: DataFrame with cycle column (modified in place)
             
         Returns:
             DataFrame with timestamp column
         """
-        df = df.copy()
-        
         # Calculate days needed based on max cycles
-        max_cycle = df['cycle'].max()
+        max_cycle = int(df['cycle'].max())
         days_needed = int(max_cycle / 24) + 1
         
         # Create timestamps
         start_date = datetime.now() - timedelta(days=days_needed)
         
-        # Add timestamp for each engine based on their cycle
-        def get_timestamp(row):
-            return start_date + timedelta(hours=int(row['cycle']))
-        
-        df['timestamp'] = df.apply(get_timestamp, axis=1)
+        # Add timestamp for each engine based on their cycle (one vectorized offset)
+        cycle_hours = pd.to_timedelta(df['cycle'].to_numpy(dtype='int64'), unit='h')
+        df['timestamp'] = pd.Timestamp(start_date) + cycle_hours
         
         return df
     
@@ -256,52 +355,60 @@ class NASADataLoader:
         - Oil Quality (use bleed enthalpy as proxy)
         
         Args:
-            df: NASA DataFrame
+            df: NASA DataFrame (modified in place)
             
         Returns:
             DataFrame in dashboard-compatible format
         """
-        df = df.copy()
-        
         # Map NASA sensors to our dashboard format
         # Using sensors that are most relevant for failure prediction
-        
-        sensor_mapping = {}
-        
-        # Temperature: Use HPC outlet temperature (sensor_3)
-        if 'sensor_3' in df.columns:
-            # Convert Rankine to Celsius: (R - 491.67) × 5/9
-            df['temperature'] = (df['sensor_3'] - 491.67) * 5/9
-            sensor_mapping['temperature'] = 'sensor_3 (HPC outlet temp)'
-        
-        # Pressure: Use total pressure at HPC outlet (sensor_7)
-        if 'sensor_7' in df.columns:
-            # Already in psia, scale to our range (30-50 PSI normal)
-            df['pressure'] = df['sensor_7'] / 10  # Normalize to reasonable range
-            sensor_mapping['pressure'] = 'sensor_7 (HPC outlet pressure)'
-        
-        # Vibration: Use physical fan speed (sensor_8) as proxy
-        if 'sensor_8' in df.columns:
-            # Normalize to 0-20 range
-            df['vibration'] = (df['sensor_8'] - df['sensor_8'].min()) / \
-                             (df['sensor_8'].max() - df['sensor_8'].min()) * 20
-            sensor_mapping['vibration'] = 'sensor_8 (fan speed)'
-        
-        # Oil Quality: Use bleed enthalpy (sensor_17) inverted as proxy
-        # Higher enthalpy = more degradation = lower "quality"
-        if 'sensor_17' in df.columns:
-            # Normalize and invert
-            normalized = (df['sensor_17'] - df['sensor_17'].min()) / \
-                        (df['sensor_17'].max() - df['sensor_17'].min())
-            df['oil_quality'] = (1 - normalized) * 100
-            sensor_mapping['oil_quality'] = 'sensor_17 (bleed enthalpy - inverted)'
+        # dashboard column -> (NASA sensor, description)
+        sources = {
+            'temperature': ('sensor_3', 'HPC outlet temp'),
+            'pressure': ('sensor_7', 'HPC outlet pressure'),
+            'vibration': ('sensor_8', 'fan speed'),
+            'oil_quality': ('sensor_17', 'bleed enthalpy - inverted')
+        }
+        sensor_mapping = {
+            dash_sensor: f"{nasa_sensor} ({description})"
+            for dash_sensor, (nasa_sensor, description) in sources.items()
+            if nasa_sensor in df.columns
+        }
+        
+        if sensor_mapping:
+            # Gather the source sensors into one matrix so min/max is a single
+            # column-wise reduction and every mapping is one broadcast
+            # (value - shift) * scale + offset
+            dash_cols = list(sensor_mapping)
+            values = df[[sources[col][0] for col in dash_cols]].to_numpy(dtype=np.float32)
+            lows = values.min(axis=0)
+            spans = values.max(axis=0) - lows
+            
+            affine = {
+                # Convert Rankine to Celsius: (R - 491.67) × 5/9
+                'temperature': lambda low, span: (491.67, 5/9, 0),
+                # Already in psia, scale to our range (30-50 PSI normal)
+                'pressure': lambda low, span: (0, 1/10, 0),
+                # Fan speed as vibration proxy, normalized to 0-20 range
+                'vibration': lambda low, span: (low, 20 / span, 0),
+                # Bleed enthalpy normalized and inverted as oil quality proxy:
+                # higher enthalpy = more degradation = lower "quality"
+                'oil_quality': lambda low, span: (low, -100 / span, 100)
+            }
+            shift, scale, offset = np.array(
+                [affine[col](low, span) for col, low, span in zip(dash_cols, lows, spans)],
+                dtype=np.float32
+            ).T
+            
+            df[dash_cols] = (values - shift) * scale + offset
         
         # Operating hours = cycle count
         df['operating_hours'] = df['cycle']
         
-        print("\n📊 Sensor Mapping for Dashboard Compatibility:")
-        for dash_sensor, nasa_sensor in sensor_mapping.items():
-            print(f"  • {dash_sensor}: {nasa_sensor}")
+        if self.verbose:
+            print("\n📊 Sensor Mapping for Dashboard Compatibility:")
+            for dash_sensor, nasa_sensor in sensor_mapping.items():
+                print(f"  • {dash_sensor}: {nasa_sensor}")
         
         return df
     
@@ -316,9 +423,12 @@ class NASADataLoader:
         Returns:
             DataFrame ready for model training
         """
-        print("\n" + "="*70)
-        print(f"LOADING NASA {self.dataset_name} DATASET")
-        print("="*70)
+        # The helpers below add columns in place instead of copying the frame at
+        # every step; the frames they receive here are fresh from the file loaders
+        if self.verbose:
+            print("\n" + "="*70)
+            print(f"LOADING NASA {self.dataset_name} DATASET")
+            print("="*70)
         
         # Load training data
         train_df = self.load_train_data()
@@ -340,22 +450,20 @@ class NASADataLoader:
         
         # Optionally add test data
         if use_test_data:
-            print("\n" + "-"*70)
-            print("Adding test data...")
+            if self.verbose:
+                print("\n" + "-"*70)
+                print("Adding test data...")
             
             test_df = self.load_test_data()
             rul_data = self.load_rul_data()
             
-            # Add RUL to test data
-            test_max_cycles = test_df.groupby('engine_id')['cycle'].max().reset_index()
-            test_max_cycles['RUL_at_end'] = rul_data['RUL'].values
+            # Add RUL to test data: RUL_FDxxx.txt lists the RUL at each test
+            # engine's last cycle, in engine_id (= sorted category) order
+            rul_at_end = rul_data['RUL'].to_numpy()[test_df['engine_id'].cat.codes.to_numpy()]
             
             # Calculate RUL for each cycle in test set
-            test_df = test_df.merge(test_max_cycles[['engine_id', 'RUL_at_end']], 
-                                   on='engine_id', how='left')
-            test_df['RUL'] = test_df['RUL_at_end'] + \
-                           (test_max_cycles.set_index('engine_id').loc[test_df['engine_id'], 'cycle'].values - 
-                            test_df['cycle'])
+            max_cycles = test_df.groupby('engine_id', observed=True, sort=False)['cycle'].transform('max')
+            test_df['RUL'] = rul_at_end + max_cycles - test_df['cycle']
             
             test_df = self.add_failure_labels(test_df, failure_threshold)
             test_df = self.select_important_sensors(test_df)
@@ -363,24 +471,35 @@ class NASADataLoader:
             test_df = self.normalize_to_dashboard_format(test_df)
             
             # Combine train and test
-            # Offset test engine IDs to avoid conflicts
-            test_df['engine_id'] = test_df['engine_id'] + train_df['engine_id'].max()
+            # Offset test engine IDs to avoid conflicts (renaming the categories)
+            train_ids = train_df['engine_id'].cat.categories
+            test_ids = test_df['engine_id'].cat.categories + train_ids.max()
+            
+            # Give both frames the same categories so engine_id stays categorical
+            engine_dtype = pd.CategoricalDtype(train_ids.append(test_ids))
+            train_df['engine_id'] = train_df['engine_id'].astype(engine_dtype)
+            test_df['engine_id'] = test_df['engine_id'].cat.rename_categories(test_ids).astype(engine_dtype)
             
+            # Both frames went through the same steps, so every column already has
+            # the same dtype on each side and concat just stacks the blocks
             combined_df = pd.concat([train_df, test_df], ignore_index=True)
-            print(f"\nCombined dataset: {len(combined_df):,} records from " +
-                  f"{combined_df['engine_id'].nunique()} engines")
+            if self.verbose:
+                print(f"\nCombined dataset: {len(combined_df):,} records from " +
+                      f"{len(engine_dtype.categories)} engines")
             
             return combined_df
         
         return train_df
     
-    def save_processed_data(self, df, output_path='../datasets/sensor_data.csv'):
+    def save_processed_data(self, df, output_path='../datasets/sensor_data.csv', parquet_copy=True):
         """
         Save processed data in format compatible with existing pipeline
         
         Args:
             df: Processed DataFrame
-            output_path: Where to save the data
+            output_path: Where to save the data (CSV)
+            parquet_copy: Also write a typed, zstd-compressed .parquet copy next
+                to the CSV, which the API, dashboard and training read first
         """
         # Ensure data directory exists
         os.makedirs('data', exist_ok=True)
@@ -392,26 +511,43 @@ class NASADataLoader:
         # Only keep columns that exist
         output_cols = [col for col in output_cols if col in df.columns]
         
-        df_output = df[output_cols].copy()
-        
-        # Save
-        df_output.to_csv(output_path, index=False)
+        # Compact dtypes (the same ones the API and dashboard read with);
+        # astype also gives us our own copy of the selected columns
+        df_output = df[output_cols].astype(
+            {col: dtype for col, dtype in SENSOR_DTYPES.items() if col in output_cols}
+        )
         
+        # Save, writing floats at the precision float32 actually carries
+        df_output.to_csv(output_path, index=False, float_format='%.4f')
         print(f"\n✅ Processed data saved to: {output_path}")
-        print(f"   Records: {len(df_output):,}")
-        print(f"   Engines: {df_output['engine_id'].nunique()}")
-        print(f"   Failure rate: {df_output['failure'].mean()*100:.2f}%")
-        print(f"   Date range: {df_output['timestamp'].min()} to {df_output['timestamp'].max()}")
         
-        # Display statistics
-        print("\n" + "="*70)
-        print("DATASET STATISTICS")
-        print("="*70)
-        print(df_output[['temperature', 'pressure', 'vibration', 'oil_quality']].describe())
+        # Written after the CSV so its mtime marks it as the current copy
+        if parquet_copy:
+            parquet_path = os.path.splitext(output_path)[0] + '.parquet'
+            df_output.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+            print(f"   Parquet copy saved to: {parquet_path}")
+        
+        # Summary statistics need extra passes over the output
+        if self.verbose:
+            print(f"   Records: {len(df_output):,}")
+            print(f"   Engines: {df_output['engine_id'].nunique()}")
+            print(f"   Failure rate: {df_output['failure'].mean()*100:.2f}%")
+            print(f"   Date range: {df_output['timestamp'].min()} to {df_output['timestamp'].max()}")
+            
+            # Display statistics
+            print("\n" + "="*70)
+            print("DATASET STATISTICS")
+            print("="*70)
+            print(df_output[['temperature', 'pressure', 'vibration', 'oil_quality']].describe())
         
         return df_output
 
 
+
+# Fingerprint of the C-MAPSS parser, part of the Feather cache name
+PARSER_CODE_VERSION = hashlib.sha256(inspect.getsource(NASADataLoader.read_cmapss_file).encode()).hexdigest()[:16]
+
+
 def main():
     """Main function to load and process NASA data"""
     
@@ -435,8 +571,8 @@ def main():
         print(f"Invalid dataset. Using FD001.")
         dataset_name = 'FD001'
     
-    # Initialize loader
-    loader = NASADataLoader(dataset_name=dataset_name)
+    # Initialize loader (only the columns the saved output is derived from)
+    loader = NASADataLoader(dataset_name=dataset_name, minimal=True, verbose=True)
     
     # Load and process data
     df = loader.prepare_complete_dataset(
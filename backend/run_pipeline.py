@@ -30,6 +30,20 @@ def run_command(description, command):
         return False
 
 
+def start_warmup():
+    """
+    Start a background process that imports the dashboard's heavy libraries,
+    so their bytecode and shared libraries are cached by the time it launches
+    
+    Returns:
+        Popen: Handle to wait on (its result doesn't matter)
+    """
+    return subprocess.Popen(
+        [sys.executable, "-c", "import streamlit, plotly, model_utils"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
 def main():
     """Run complete pipeline"""
     
@@ -55,10 +69,13 @@ def main():
         print("Pipeline failed at data generation step.")
         sys.exit(1)
     
-    # Step 2: Train model
+    # Step 2: Train model, warming up the dashboard's imports alongside it
+    warmup = start_warmup()
     if not run_command("STEP 2: Training ML Model", "python train_model.py"):
+        warmup.kill()
         print("Pipeline failed at model training step.")
         sys.exit(1)
+    warmup.wait()
     
     # Step 3: Launch dashboard
     print_header("STEP 3: Launching Dashboard")
@@ -0,0 +1,9 @@
+"""
+Pytest configuration: the backend modules import each other as top-level
+modules, so make backend/ importable
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
@@ -0,0 +1,115 @@
+"""
+Parity tests for the hand-written kernels in model_utils against the pandas
+and sklearn implementations they replace
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import classification_report
+
+from model_utils import FeatureEngineer, ModelEvaluator, rolling_mean_std_diff
+
+SENSOR_COLS = ['temperature', 'pressure', 'vibration', 'oil_quality']
+
+
+def make_sensor_frame(seed=0):
+    """
+    Unsorted multi-engine readings, including engines shorter than the
+    window, a constant run and missing values
+    """
+    rng = np.random.default_rng(seed)
+    lengths = [1, 2, 5, 23, 24, 25, 80]
+    engine_id = np.repeat(np.arange(len(lengths)), lengths)
+    hours = np.concatenate([np.arange(n) for n in lengths])
+    df = pd.DataFrame({
+        'timestamp': pd.Timestamp('2025-01-01') + pd.to_timedelta(hours, unit='h'),
+        'engine_id': engine_id.astype(np.int16),
+        'operating_hours': hours.astype(np.int32),
+        **{col: (rng.normal(50, 10, engine_id.size)).astype(np.float32) for col in SENSOR_COLS},
+        'failure': (rng.random(engine_id.size) < 0.1).astype(np.int8)
+    })
+    df.loc[df.index[-20:-5], 'pressure'] = np.float32(42.5)
+    df.loc[df.index[[3, 40, 41, 100]], 'vibration'] = np.nan
+    return df.sample(frac=1, random_state=seed)
+
+
+def pandas_temporal_features(df, window):
+    """Reference: per-engine rolling mean/std and diff with pandas"""
+    df = df.sort_values(['engine_id', 'timestamp'])
+    grouped = df.groupby('engine_id')
+    expected = {}
+    for col in SENSOR_COLS:
+        rolling = grouped[col].rolling(window=window, min_periods=1)
+        expected[f'{col}_rolling_mean'] = rolling.mean().reset_index(level=0, drop=True)
+        expected[f'{col}_rolling_std'] = rolling.std().reset_index(level=0, drop=True).fillna(0)
+        expected[f'{col}_rate_of_change'] = grouped[col].diff().fillna(0)
+    return pd.DataFrame(expected)
+
+
+@pytest.mark.parametrize('window', [1, 3, 24])
+def test_temporal_features_match_pandas_rolling(window):
+    df = make_sensor_frame()
+    expected = pandas_temporal_features(df, window)
+    
+    result = FeatureEngineer(window_size=window).create_temporal_features(df.copy())
+    
+    for col in expected.columns:
+        np.testing.assert_allclose(
+            result[col].to_numpy(dtype=np.float64),
+            expected.loc[result.index, col].to_numpy(dtype=np.float64),
+            rtol=1e-6, atol=1e-6, err_msg=col
+        )
+
+
+def test_rolling_kernel_matches_pandas_on_engine_ranges():
+    df = make_sensor_frame(seed=1).sort_values(['engine_id', 'timestamp'])
+    engine_ids = df['engine_id'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, engine_ids[1:] != engine_ids[:-1]])
+    ends = np.r_[starts[1:], len(df)]
+    values = np.ascontiguousarray(df[SENSOR_COLS].to_numpy().T)
+    
+    mean, std, diff = rolling_mean_std_diff(values, starts, ends, 24)
+    
+    expected = pandas_temporal_features(df, 24)
+    for i, col in enumerate(SENSOR_COLS):
+        np.testing.assert_allclose(mean[i], expected[f'{col}_rolling_mean'], rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(std[i], expected[f'{col}_rolling_std'], rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(diff[i], expected[f'{col}_rate_of_change'], rtol=1e-6, atol=1e-6)
+
+
+def labels_from_counts(tn, fp, fn, tp):
+    """Build (y_true, y_pred) arrays with the given confusion-matrix counts"""
+    y_true = np.repeat([0, 0, 1, 1], [tn, fp, fn, tp])
+    y_pred = np.repeat([0, 1, 0, 1], [tn, fp, fn, tp])
+    return y_true, y_pred
+
+
+@pytest.mark.parametrize('counts', [
+    (4064, 39, 7, 17),     # typical test split
+    (40, 0, 10, 0),        # all-zero predictions
+    (0, 10, 0, 0),         # no correct prediction at all
+    (6, 0, 0, 0),          # a single class
+    (1, 2, 3, 4),
+    (0, 0, 5, 5),
+])
+def test_classification_report_matches_sklearn(counts):
+    y_true, y_pred = labels_from_counts(*counts)
+    expected = classification_report(
+        y_true, y_pred, labels=[0, 1], target_names=['Normal', 'Failure'], zero_division=0
+    )
+    
+    assert ModelEvaluator.binary_classification_report(*counts) == expected
+
+
+def test_classification_report_matches_sklearn_on_small_counts():
+    for counts in itertools.product(range(3), repeat=4):
+        if sum(counts) == 0:
+            continue
+        y_true, y_pred = labels_from_counts(*counts)
+        expected = classification_report(
+            y_true, y_pred, labels=[0, 1], target_names=['Normal', 'Failure'], zero_division=0
+        )
+        assert ModelEvaluator.binary_classification_report(*counts) == expected, counts